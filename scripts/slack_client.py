@@ -4,25 +4,140 @@ Slack client using browser tokens (xoxc/xoxd) for stealth mode.
 Supports multiple workspaces with contextual auto-selection.
 """
 
-import requests
 import json
 import sys
+import atexit
+import functools
+import hashlib
+import os
+import tempfile
+import threading
 import time
-import uuid
 import re
-import subprocess
 from pathlib import Path
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
-from typing import Optional
+
+try:
+    import orjson  # Optional: much faster JSON parsing/serialisation
+except ImportError:
+    orjson = None
 
 # Cache staleness threshold
 USER_CACHE_STALE_DAYS = 14
 
+# How long the most recently used workspace stays active
+ACTIVE_WORKSPACE_TTL_SECONDS = 600
+# Re-selecting the active workspace within this window skips the state write
+ACTIVE_WORKSPACE_REFRESH_SECONDS = 60
+
+# Freshness windows for cached API responses
+AUTH_TEST_MAX_AGE_SECONDS = 60
+AUTH_IDENTITY_MAX_AGE_SECONDS = 24 * 3600  # user/team behind a token, for digests
+USERS_LIST_MAX_AGE_SECONDS = 600
+CHANNELS_LIST_MAX_AGE_SECONDS = 300
+
+# Defaults for the channels/history/search commands
+DEFAULT_CHANNEL_TYPES = "public_channel,private_channel,im,mpim"
+DEFAULT_HISTORY_LIMIT = 100
+DEFAULT_SEARCH_COUNT = 20
+
+# Minimum gap between export state checkpoints (phase changes always save)
+EXPORT_CHECKPOINT_INTERVAL_SECONDS = 5
+
+# Concurrent API fetches during export (search pages in Phase 1, threads in Phase 2)
+EXPORT_FETCH_WORKERS = 8
+
+# Concurrent conversations.replies fetches while building a digest
+DIGEST_FETCH_WORKERS = 5
+# Search pages (of 100 matches) read per digest query
+DIGEST_SEARCH_MAX_PAGES = 5
+# Digest message texts are truncated to this many characters
+DIGEST_TEXT_MAX_CHARS = 500
+
 SKILL_ROOT = Path(__file__).parent.parent
 CONFIG_PATH = SKILL_ROOT / "config.json"
 SESSION_STATE_PATH = SKILL_ROOT / "session-state.json"
 DIGEST_CONFIG_PATH = SKILL_ROOT / "digest-config.json"
 
+# Workspace subdomain from an auth.test URL like "https://80000hours.slack.com/"
+_WORKSPACE_URL_RE = re.compile(r"https?://([^./]+)\.slack\.com/?")
+# Parent thread ts from a search-result permalink like ".../p123?thread_ts=1234567890.123456"
+_THREAD_TS_RE = re.compile(r"thread_ts=(\d+\.\d+)")
+# Export --from/--to dates, as used in Slack's after:/before: search modifiers
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# Message subtypes for channel events (joins, topic changes...) left out of digests
+_SYSTEM_SUBTYPES = frozenset({
+    "channel_join", "channel_leave", "channel_topic", "channel_purpose",
+    "channel_name", "bot_add", "bot_remove",
+})
+
+# In-process caches for config/session files, keyed on file mtime
+_CONFIG_CACHE = {"mtime": None, "data": None}
+_STATE_CACHE = {"mtime": None, "data": None}
+_DIGEST_CONFIG_CACHE = {"mtime": None, "data": None}
+_PENDING_STATE = {}  # Session state updates not yet written to disk
+_FLUSH_REGISTERED = False  # Whether flush_session_state is registered with atexit
+
+
+# ==================== JSON Helpers ====================
+
+def json_loads(data: bytes | str):
+    """Parse JSON, using orjson when available."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_indented(obj) -> bytes:
+    """Serialise to indented JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def emit(obj) -> None:
+    """Write a CLI result to stdout as indented JSON."""
+    data = json_dumps_indented(obj)
+    sys.stdout.flush()  # Keep ordering with anything printed via the text layer
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def json_dumps_compact(obj) -> bytes:
+    """Serialise to compact JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def read_json(path: Path):
+    """Read and parse a JSON file, using orjson when available."""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def _mtime_ns(path: Path) -> int | None:
+    """Get a file's mtime with a single stat() call, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def atomic_write_json(path: Path, obj):
+    """Write indented JSON via a temp file + rename so readers never see a partial file."""
+    data = json_dumps_indented(obj)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 
 # ==================== Rate Limiter ====================
 
@@ -33,84 +148,99 @@ class RateLimiter:
     Tier 3 (search.messages): ~50 req/min
     Tier 4 (conversations.replies): ~100 req/min
 
-    Uses conservative limits to avoid ever hitting actual rate limits.
+    Each tier is a token bucket that refills at a conservative per-minute
+    rate and allows a short burst, so calls are spread out rather than
+    exhausting a window and then stalling. Burst plus one minute of refill
+    stays under Slack's limit.
+    Thread-safe: concurrent callers queue on a lock, so the limits hold
+    across a pool of workers.
     """
 
     TIER_3_LIMIT = 35  # search - conservative to never hit 50
     TIER_4_LIMIT = 70  # replies - conservative to never hit 100
+    TIER_3_BURST = 10
+    TIER_4_BURST = 20
 
     def __init__(self):
-        self.tier3_calls = []  # timestamps of search calls
-        self.tier4_calls = []  # timestamps of replies calls
-        self.backoff_until = None
+        now = time.monotonic()
+        # Available tokens and the monotonic time they were last topped up
+        self.tier3_bucket = {"tokens": float(self.TIER_3_BURST), "last": now}
+        self.tier4_bucket = {"tokens": float(self.TIER_4_BURST), "last": now}
+        self.backoff_until = None  # monotonic deadline, or None
         self.consecutive_429s = 0
+        self._lock = threading.Lock()
+        # Set to wake sleeping callers early, e.g. when an export stops
+        self.stop = threading.Event()
 
-    def _prune_old_calls(self, calls: list, window_seconds: int = 60) -> list:
-        """Remove calls older than the window."""
-        cutoff = datetime.now() - timedelta(seconds=window_seconds)
-        return [t for t in calls if t > cutoff]
+    def _take_token(self, bucket: dict, limit: int, burst: int):
+        """
+        Take the tier's next token, sleeping until it's due.
 
-    def _handle_backoff(self):
-        """Sleep if we're in a backoff period."""
-        if self.backoff_until and datetime.now() < self.backoff_until:
-            sleep_time = (self.backoff_until - datetime.now()).total_seconds()
-            if sleep_time > 0:
+        The token is reserved under the lock (the bucket may go into debt)
+        and the sleep happens outside it, so waiters don't hold each other
+        up and setting stop wakes them all at once.
+        """
+        with self._lock:
+            now = time.monotonic()
+            rate = limit / 60  # tokens per second
+            # A drained bucket doesn't refill until its backoff ends
+            start = max(now, bucket["last"])
+            tokens = min(burst, bucket["tokens"] + (start - bucket["last"]) * rate)
+            ready = start + max(0.0, 1 - tokens) / rate
+            bucket["tokens"] = tokens - 1
+            bucket["last"] = start
+            backing_off = self.backoff_until is not None and self.backoff_until > now
+
+        sleep_time = ready - now
+        if sleep_time > 0:
+            if backing_off:
                 print(f"  Rate limit backoff: sleeping {sleep_time:.1f}s", file=sys.stderr)
-                time.sleep(sleep_time)
-            self.backoff_until = None
+            self.stop.wait(sleep_time)
 
     def wait_for_tier3(self):
         """Wait if needed before making a Tier 3 call (search)."""
-        self._handle_backoff()
-        self.tier3_calls = self._prune_old_calls(self.tier3_calls)
-
-        if len(self.tier3_calls) >= self.TIER_3_LIMIT:
-            oldest = min(self.tier3_calls)
-            sleep_time = 60 - (datetime.now() - oldest).total_seconds() + 1
-            if sleep_time > 0:
-                print(f"  Tier 3 limit: sleeping {sleep_time:.1f}s", file=sys.stderr)
-                time.sleep(sleep_time)
-            self.tier3_calls = self._prune_old_calls(self.tier3_calls)
-
-        self.tier3_calls.append(datetime.now())
+        self._take_token(self.tier3_bucket, self.TIER_3_LIMIT, self.TIER_3_BURST)
 
     def wait_for_tier4(self):
         """Wait if needed before making a Tier 4 call (replies)."""
-        self._handle_backoff()
-        self.tier4_calls = self._prune_old_calls(self.tier4_calls)
-
-        if len(self.tier4_calls) >= self.TIER_4_LIMIT:
-            oldest = min(self.tier4_calls)
-            sleep_time = 60 - (datetime.now() - oldest).total_seconds() + 1
-            if sleep_time > 0:
-                print(f"  Tier 4 limit: sleeping {sleep_time:.1f}s", file=sys.stderr)
-                time.sleep(sleep_time)
-            self.tier4_calls = self._prune_old_calls(self.tier4_calls)
-
-        self.tier4_calls.append(datetime.now())
+        self._take_token(self.tier4_bucket, self.TIER_4_LIMIT, self.TIER_4_BURST)
 
     def handle_rate_limit_response(self, retry_after: int = None):
         """Called when we receive a 429 or rate_limited error."""
-        self.consecutive_429s += 1
-
-        # Exponential backoff: 30s, 60s, 120s, 240s, max 5min
-        if retry_after:
-            wait_seconds = retry_after
-        else:
-            wait_seconds = min(30 * (2 ** (self.consecutive_429s - 1)), 300)
+        with self._lock:
+            if self.backoff_until and self.backoff_until > time.monotonic():
+                return  # Another worker already backed off for this burst
+            self.consecutive_429s += 1
+
+            # Exponential backoff: 30s, 60s, 120s, 240s, max 5min
+            if retry_after:
+                wait_seconds = retry_after
+            else:
+                wait_seconds = min(30 * (2 ** (self.consecutive_429s - 1)), 300)
 
-        self.backoff_until = datetime.now() + timedelta(seconds=wait_seconds)
-        print(f"  Rate limited! Backing off {wait_seconds}s", file=sys.stderr)
+            self.backoff_until = time.monotonic() + wait_seconds
+            # Drain the buckets so calls resume at the refill rate, not in a burst
+            for bucket in (self.tier3_bucket, self.tier4_bucket):
+                bucket["tokens"] = 0.0
+                bucket["last"] = self.backoff_until
+            print(f"  Rate limited! Backing off {wait_seconds}s", file=sys.stderr)
 
     def reset_backoff(self):
         """Called after a successful request."""
-        self.consecutive_429s = 0
+        with self._lock:
+            self.consecutive_429s = 0
 
 
 class SlackClient:
     BASE_URL = "https://slack.com/api"
 
     def __init__(self, xoxc_token: str, xoxd_token: str, user_agent: str = None):
+        # Imported here so local-only commands (workspaces, switch, ...) skip the
+        # ~100 ms cost of importing requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.token = xoxc_token
         self.cookies = {"d": xoxd_token}
         self.user_agent = user_agent or (
@@ -123,29 +253,61 @@ class SlackClient:
             "User-Agent": self.user_agent,
             "Accept-Language": "en-NZ,en-AU;q=0.9,en;q=0.8",
             "Content-Type": "application/x-www-form-urlencoded",
+            "Accept-Encoding": "gzip, deflate",
         })
-
-    def _post(self, endpoint: str, data: dict = None) -> dict:
-        """Make authenticated POST request with stealth fields."""
-        payload = {
+        # All traffic goes to one host; keep its connections alive across calls.
+        # Connection failures and 502/503 are retried with backoff. Read errors
+        # and 504 are not, since the call may have landed; chat.postMessage also
+        # skips the 502/503 retries, as a gateway error can follow a posted message.
+        # 429s come straight back (urllib3 would otherwise retry them when
+        # Retry-After is set) so the shared RateLimiter handles the backoff.
+        retry = Retry(
+            total=3,
+            read=False,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        self.session.mount(self.BASE_URL, HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                                      max_retries=retry))
+        self.session.mount(f"{self.BASE_URL}/chat.postMessage",
+                           HTTPAdapter(max_retries=retry.new(status_forcelist=())))
+        self._workspace = None  # Workspace subdomain, resolved lazily via auth.test
+        self._auth = None  # (monotonic fetch time, last successful auth.test response)
+
+        # Encoded once: the token and stealth fields are identical on every request
+        self._body_prefix = urlencode({
             "token": self.token,
             "_x_reason": "api-call",
             "_x_mode": "online",
             "_x_sonic": "true",
             "_x_app_name": "client",
-            **(data or {})
-        }
+        }).encode()
+        self._url_prefix = f"{self.BASE_URL}/"
+
+    def _post(self, endpoint: str, data: dict = None) -> dict:
+        """Make authenticated POST request with stealth fields."""
+        body = self._body_prefix + b"&" + urlencode(data).encode() if data else self._body_prefix
 
         response = self.session.post(
-            f"{self.BASE_URL}/{endpoint}",
-            data=payload,
+            self._url_prefix + endpoint,
+            data=body,
             cookies=self.cookies
         )
-        return response.json()
+        # Parse raw bytes directly - skips requests' charset detection and decode
+        result = json_loads(response.content)
+        if response.status_code == 429:
+            # Pass on how long Slack asked us to wait (seconds)
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                result["retry_after"] = int(retry_after)
+        return result
 
     # ==================== Core Functions ====================
 
-    def channels_list(self, types: str = "public_channel,private_channel,im,mpim",
+    def channels_list(self, types: str = DEFAULT_CHANNEL_TYPES,
                       limit: int = 200) -> dict:
         """List channels, DMs, and group DMs."""
         return self._post("conversations.list", {
@@ -154,12 +316,32 @@ class SlackClient:
             "exclude_archived": "true"
         })
 
-    def conversations_history(self, channel: str, limit: int = 100) -> dict:
-        """Get message history from a channel or DM."""
-        return self._post("conversations.history", {
+    def conversations_history(self, channel: str, limit: int = 100,
+                              fields: tuple[str, ...] = None, cursor: str = None) -> dict:
+        """
+        Get message history from a channel or DM.
+
+        Args:
+            channel: Channel ID
+            limit: Maximum number of messages
+            fields: Optional message keys to keep (e.g. ("ts", "user", "text")).
+                    Drops bulky blocks/attachments metadata from the result.
+            cursor: Pagination cursor from a previous response's
+                    response_metadata.next_cursor
+        """
+        data = {
             "channel": channel,
             "limit": str(limit)
-        })
+        }
+        if cursor:
+            data["cursor"] = cursor
+        result = self._post("conversations.history", data)
+        if fields and result.get("ok"):
+            result["messages"] = [
+                {k: msg[k] for k in fields if k in msg}
+                for msg in result.get("messages", [])
+            ]
+        return result
 
     def conversations_replies(self, channel: str, thread_ts: str) -> dict:
         """Get replies in a thread."""
@@ -168,14 +350,18 @@ class SlackClient:
             "ts": thread_ts
         })
 
-    def search_messages(self, query: str, count: int = 20, sort: str = "timestamp") -> dict:
-        """Search for messages. Supports Slack search modifiers like from:, in:, after:, etc."""
-        return self._post("search.messages", {
+    def search_messages(self, query: str, count: int = 20, sort: str = "timestamp",
+                        page: int = 1) -> dict:
+        """Search for messages, newest first. Supports Slack search modifiers like from:, in:, after:, etc."""
+        data = {
             "query": query,
             "count": str(count),
             "sort": sort,
             "sort_dir": "desc"
-        })
+        }
+        if page > 1:
+            data["page"] = str(page)
+        return self._post("search.messages", data)
 
     def search_messages_paginated(self, query: str, page: int = 1, count: int = 100,
                                    sort: str = "timestamp") -> dict:
@@ -216,8 +402,18 @@ class SlackClient:
         return self._post("users.list", {"limit": str(limit)})
 
     def auth_test(self) -> dict:
-        """Test authentication and get current user info."""
-        return self._post("auth.test")
+        """
+        Test authentication and get current user info.
+
+        Successful responses are reused for AUTH_TEST_MAX_AGE_SECONDS, so a
+        long-lived client (daemon, batch) doesn't repeat the round-trip.
+        """
+        if self._auth and time.monotonic() - self._auth[0] < AUTH_TEST_MAX_AGE_SECONDS:
+            return dict(self._auth[1])
+        result = self._post("auth.test")
+        if result.get("ok"):
+            self._auth = (time.monotonic(), result)
+        return dict(result)
 
     def get_permalink(self, channel: str, message_ts: str, workspace: str = None,
                       link_style: str = "app") -> str:
@@ -228,7 +424,7 @@ class SlackClient:
             channel: Channel ID (e.g., C04AFNMCNFP)
             message_ts: Message timestamp (e.g., 1734567890.123456)
             workspace: Workspace name (e.g., "80000hours"). If not provided,
-                      fetches from auth.test API.
+                      fetches from auth.test API (once per client).
             link_style: "app" for native Slack app, "browser" for web browser.
                        - app: uses /archives/ path (opens in Slack app)
                        - browser: uses /messages/ path (opens in browser)
@@ -236,30 +432,51 @@ class SlackClient:
         Returns:
             Permalink URL
         """
+        return self.get_permalinks([(channel, message_ts)], workspace, link_style)[0]
+
+    def get_permalinks(self, messages: list[tuple[str, str]], workspace: str = None,
+                       link_style: str = "app") -> list[str]:
+        """
+        Generate permalinks for many messages, building the URL prefix once.
+
+        Args:
+            messages: (channel_id, message_ts) pairs
+            workspace: Workspace name. If not provided, resolved via auth.test.
+            link_style: "app" or "browser" (see get_permalink)
+
+        Returns:
+            Permalink URLs, in the same order as messages
+        """
+        prefix = self._permalink_prefix(workspace, link_style)
+        # Permalink timestamps drop the "." from the message ts
+        return [f"{prefix}{channel}/p{ts.replace('.', '')}" for channel, ts in messages]
+
+    def _permalink_prefix(self, workspace: str = None, link_style: str = "app") -> str:
+        """Build "https://<workspace>.slack.com/<path>/", resolving the workspace if needed."""
+        if not workspace:
+            workspace = self._workspace
         if not workspace:
             auth = self.auth_test()
             if not auth.get("ok"):
                 raise ValueError(f"Failed to get workspace: {auth.get('error')}")
             # Extract workspace from URL like "https://80000hours.slack.com/"
             url = auth.get("url", "")
-            workspace = url.replace("https://", "").replace(".slack.com/", "")
-
-        # Format timestamp: remove the "." to create the permalink format
-        formatted_ts = message_ts.replace(".", "")
+            match = _WORKSPACE_URL_RE.match(url)
+            workspace = match.group(1) if match else url
+            self._workspace = workspace
 
         # Choose path based on link style
         path = "messages" if link_style == "browser" else "archives"
 
-        return f"https://{workspace}.slack.com/{path}/{channel}/p{formatted_ts}"
+        return f"https://{workspace}.slack.com/{path}/"
 
 
 # ==================== Session State Management ====================
 
-def load_session_state() -> dict:
-    """Load current session state."""
+def _read_session_state() -> dict:
+    """Read session state from disk, or return a fresh default state."""
     if SESSION_STATE_PATH.exists():
-        with open(SESSION_STATE_PATH) as f:
-            return json.load(f)
+        return read_json(SESSION_STATE_PATH)
     return {
         "active_workspace": None,
         "last_action_timestamp": None,
@@ -267,30 +484,96 @@ def load_session_state() -> dict:
     }
 
 
+def load_session_state() -> dict:
+    """
+    Load current session state.
+
+    The parsed state is cached in-process and only re-read when the file
+    changes. Unflushed in-memory updates always take precedence.
+    """
+    if _PENDING_STATE:
+        return _STATE_CACHE["data"]
+
+    mtime = _mtime_ns(SESSION_STATE_PATH)
+    if _STATE_CACHE["data"] is None or _STATE_CACHE["mtime"] != mtime:
+        _STATE_CACHE["data"] = _read_session_state()
+        _STATE_CACHE["mtime"] = mtime
+    return _STATE_CACHE["data"]
+
+
 def save_session_state(state: dict):
     """Save session state."""
-    with open(SESSION_STATE_PATH, "w") as f:
-        json.dump(state, f, indent=2)
+    atomic_write_json(SESSION_STATE_PATH, state)
+
+
+def flush_session_state():
+    """
+    Merge pending session state updates into the on-disk state and write once.
+
+    Re-reading at flush time keeps updates from concurrent CLI invocations.
+    """
+    if not _PENDING_STATE:
+        return
+    state = _read_session_state()
+    channel_map = _PENDING_STATE.pop("workspace_channel_map", {})
+    state.update(_PENDING_STATE)
+    state.setdefault("workspace_channel_map", {}).update(channel_map)
+    save_session_state(state)
+
+    _PENDING_STATE.clear()
+    _STATE_CACHE["data"] = state
+    _STATE_CACHE["mtime"] = SESSION_STATE_PATH.stat().st_mtime_ns
+
+
+def _queue_session_update(key: str, value):
+    """Apply an update in memory and queue it for the single write at exit."""
+    global _FLUSH_REGISTERED
+    if not _FLUSH_REGISTERED:
+        # Once per process: the daemon flushes after every request, so
+        # registering whenever the queue refills would pile up handlers
+        atexit.register(flush_session_state)
+        _FLUSH_REGISTERED = True
+    state = load_session_state()
+    if key == "workspace_channel_map":
+        state.setdefault(key, {}).update(value)
+        _PENDING_STATE.setdefault(key, {}).update(value)
+    else:
+        state[key] = value
+        _PENDING_STATE[key] = value
 
 
 def set_active_workspace(workspace: str):
     """Set the active workspace for this session."""
+    now = time.time()
     state = load_session_state()
-    state["active_workspace"] = workspace
-    state["last_action_timestamp"] = datetime.now().isoformat()
-    save_session_state(state)
+    last_epoch = state.get("last_action_epoch")
+    if (state.get("active_workspace") == workspace and isinstance(last_epoch, (int, float))
+            and now - last_epoch < ACTIVE_WORKSPACE_REFRESH_SECONDS):
+        return  # Already active and recently refreshed; the TTL barely moves
+
+    _queue_session_update("active_workspace", workspace)
+    # Epoch for cheap freshness checks; ISO string kept for readability
+    _queue_session_update("last_action_epoch", now)
+    _queue_session_update("last_action_timestamp", datetime.fromtimestamp(now).isoformat())
 
 
 def get_active_workspace() -> str | None:
     """Get the active workspace if recent (within 10 minutes)."""
     state = load_session_state()
     active = state.get("active_workspace")
-    last_action = state.get("last_action_timestamp")
+    if not active:
+        return None
 
-    if active and last_action:
+    last_epoch = state.get("last_action_epoch")
+    if isinstance(last_epoch, (int, float)):
+        return active if time.time() - last_epoch < ACTIVE_WORKSPACE_TTL_SECONDS else None
+
+    # State written before last_action_epoch existed
+    last_action = state.get("last_action_timestamp")
+    if last_action:
         try:
             last = datetime.fromisoformat(last_action)
-            if datetime.now() - last < timedelta(minutes=10):
+            if datetime.now() - last < timedelta(seconds=ACTIVE_WORKSPACE_TTL_SECONDS):
                 return active
         except (ValueError, TypeError):
             pass
@@ -299,9 +582,9 @@ def get_active_workspace() -> str | None:
 
 def record_channel_workspace(channel_id: str, workspace: str):
     """Record which workspace a channel belongs to."""
-    state = load_session_state()
-    state["workspace_channel_map"][channel_id] = workspace
-    save_session_state(state)
+    if load_session_state().get("workspace_channel_map", {}).get(channel_id) == workspace:
+        return
+    _queue_session_update("workspace_channel_map", {channel_id: workspace})
 
 
 def infer_workspace_from_channel(channel_id: str) -> str | None:
@@ -312,6 +595,7 @@ def infer_workspace_from_channel(channel_id: str) -> str | None:
 
 # ==================== Cache Management ====================
 
+@functools.lru_cache(maxsize=None)
 def get_cache_path(workspace: str) -> Path:
     """Get the cache file path for a specific workspace."""
     return SKILL_ROOT / f"slack-cache-{workspace}.json"
@@ -321,12 +605,11 @@ def load_cache(workspace: str) -> dict:
     """Load cache for a specific workspace."""
     cache_path = get_cache_path(workspace)
     if cache_path.exists():
-        with open(cache_path) as f:
-            cache = json.load(f)
-            # Ensure users section exists
-            if "users" not in cache:
-                cache["users"] = {}
-            return cache
+        cache = read_json(cache_path)
+        # Ensure users section exists
+        if "users" not in cache:
+            cache["users"] = {}
+        return cache
     return {
         "user": None,
         "self_dm_channel": None,
@@ -340,9 +623,76 @@ def load_cache(workspace: str) -> dict:
 
 def save_cache(workspace: str, cache: dict):
     """Save cache for a specific workspace."""
-    cache_path = get_cache_path(workspace)
-    with open(cache_path, "w") as f:
-        json.dump(cache, f, indent=2)
+    atomic_write_json(get_cache_path(workspace), cache)
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache_path(workspace: str) -> Path:
+    """Get the API response cache file path for a specific workspace."""
+    return SKILL_ROOT / f"slack-response-cache-{workspace}.json"
+
+
+@functools.lru_cache(maxsize=None)
+def get_auth_cache_path(workspace: str) -> Path:
+    """Get the auth.test identity cache file path for a specific workspace."""
+    return SKILL_ROOT / f"slack-auth-cache-{workspace}.json"
+
+
+def get_cached_response(workspace: str, key: str, max_age_seconds: int, fetch,
+                        cache_path: Path = None) -> dict:
+    """
+    Return a cached API response if fresh, otherwise call fetch() and cache it.
+
+    Responses are kept separate from slack-cache-{workspace}.json because
+    full users.list/conversations.list payloads can be large.
+
+    Args:
+        workspace: Workspace name
+        key: Cache key (e.g. "users.list")
+        max_age_seconds: Maximum age of a cached response before refetching
+        fetch: Callable returning the API response
+        cache_path: File to cache in (defaults to the workspace's response cache)
+
+    Returns:
+        API response dict
+    """
+    if cache_path is None:
+        cache_path = get_response_cache_path(workspace)
+    cache = {}
+    if cache_path.exists():
+        cache = read_json(cache_path)
+
+    entry = cache.get(key)
+    if entry:
+        try:
+            age = datetime.now() - datetime.fromisoformat(entry["fetched_at"])
+            if age < timedelta(seconds=max_age_seconds):
+                return entry["data"]
+        except (KeyError, ValueError, TypeError):
+            pass
+
+    result = fetch()
+    if result.get("ok"):
+        cache[key] = {"data": result, "fetched_at": datetime.now().isoformat()}
+        atomic_write_json(cache_path, cache)
+    return result
+
+
+def cached_auth_test(client: 'SlackClient', workspace: str) -> dict:
+    """
+    auth.test for the client's token, reused across invocations.
+
+    The user behind a token doesn't change, so a successful response is kept
+    for AUTH_IDENTITY_MAX_AGE_SECONDS. The key includes a hash of the token,
+    so re-adding a workspace with other credentials fetches afresh.
+
+    Kept in its own small file: the response cache also holds full
+    users.list/conversations.list payloads, too big to parse for one id.
+    """
+    token_hash = hashlib.blake2b(client.token.encode(), digest_size=8).hexdigest()
+    return get_cached_response(workspace, f"auth.test:{token_hash}",
+                               AUTH_IDENTITY_MAX_AGE_SECONDS, client.auth_test,
+                               cache_path=get_auth_cache_path(workspace))
 
 
 def fetch_and_cache_users(client: 'SlackClient', workspace: str) -> dict:
@@ -353,10 +703,9 @@ def fetch_and_cache_users(client: 'SlackClient', workspace: str) -> dict:
         dict with stats about the update
     """
     cache = load_cache(workspace)
-    if "users" not in cache:
-        cache["users"] = {}
+    users = cache.setdefault("users", {})
 
-    existing_count = len(cache["users"])
+    existing_count = len(users)
     new_count = 0
     updated_count = 0
 
@@ -383,22 +732,24 @@ def fetch_and_cache_users(client: 'SlackClient', workspace: str) -> dict:
             if user.get("is_bot") or user.get("deleted"):
                 continue
 
-            profile = user.get("profile", {})
+            profile = user.get("profile") or {}
+            name = user.get("name", "")
+            real_name = profile.get("real_name", "")
             user_data = {
-                "username": user.get("name", ""),
-                "display_name": profile.get("display_name") or profile.get("real_name") or user.get("name", ""),
-                "real_name": profile.get("real_name", ""),
+                "username": name,
+                "display_name": profile.get("display_name") or real_name or name,
+                "real_name": real_name,
                 "first_name": profile.get("first_name", ""),
             }
 
-            if user_id in cache["users"]:
-                # Check if anything changed
-                if cache["users"][user_id] != user_data:
-                    cache["users"][user_id] = user_data
-                    updated_count += 1
-            else:
-                cache["users"][user_id] = user_data
+            cached = users.get(user_id)
+            if cached is None:
+                users[user_id] = user_data
                 new_count += 1
+            elif cached != user_data:
+                # Four short string fields; the comparison stops at the first difference
+                users[user_id] = user_data
+                updated_count += 1
 
         # Check for more pages
         cursor = result.get("response_metadata", {}).get("next_cursor")
@@ -409,21 +760,26 @@ def fetch_and_cache_users(client: 'SlackClient', workspace: str) -> dict:
     save_cache(workspace, cache)
 
     return {
-        "total_users": len(cache["users"]),
+        "total_users": len(users),
         "new": new_count,
         "updated": updated_count,
         "previously_cached": existing_count
     }
 
 
-def get_user_lookup(workspace: str) -> dict:
+def get_user_lookup(workspace: str, cache: dict = None) -> dict:
     """
     Get a user ID to display name lookup from the cache.
 
+    Args:
+        workspace: Workspace name
+        cache: The workspace cache, if already loaded (saves re-reading the file)
+
     Returns:
         dict mapping user_id -> display_name
     """
-    cache = load_cache(workspace)
+    if cache is None:
+        cache = load_cache(workspace)
     lookup = {}
 
     # Add from users cache
@@ -442,16 +798,18 @@ def get_user_lookup(workspace: str) -> dict:
     return lookup
 
 
-def is_user_cache_empty(workspace: str) -> bool:
-    """Check if user cache is empty or missing."""
-    cache = load_cache(workspace)
+def is_user_cache_empty(workspace: str, cache: dict = None) -> bool:
+    """Check if user cache is empty or missing (pass cache if already loaded)."""
+    if cache is None:
+        cache = load_cache(workspace)
     users = cache.get("users", {})
     return len(users) == 0
 
 
-def is_user_cache_stale(workspace: str) -> bool:
-    """Check if user cache is stale (older than USER_CACHE_STALE_DAYS)."""
-    cache = load_cache(workspace)
+def is_user_cache_stale(workspace: str, cache: dict = None) -> bool:
+    """Check if user cache is stale (older than USER_CACHE_STALE_DAYS; pass cache if already loaded)."""
+    if cache is None:
+        cache = load_cache(workspace)
     last_updated = cache.get("users_last_updated")
 
     if not last_updated:
@@ -470,6 +828,8 @@ def trigger_background_user_refresh(workspace: str):
     Trigger a background refresh of the user cache.
     Runs fetch-users in a detached subprocess.
     """
+    import subprocess
+
     script_path = Path(__file__).resolve()
     cmd = [sys.executable, str(script_path), "-w", workspace, "fetch-users"]
 
@@ -484,17 +844,23 @@ def trigger_background_user_refresh(workspace: str):
 
 # ==================== Export State Management ====================
 
+@functools.lru_cache(maxsize=None)
 def get_export_state_path(workspace: str) -> Path:
     """Get the export state file path for a specific workspace."""
     return SKILL_ROOT / f"export-state-{workspace}.json"
 
 
+@functools.lru_cache(maxsize=None)
+def get_export_data_path(workspace: str) -> Path:
+    """Get the append-only export data file path for a specific workspace."""
+    return SKILL_ROOT / f"export-data-{workspace}.jsonl"
+
+
 def load_export_state(workspace: str) -> dict:
     """Load export state for resume capability."""
     state_path = get_export_state_path(workspace)
     if state_path.exists():
-        with open(state_path) as f:
-            return json.load(f)
+        return read_json(state_path)
     return None
 
 
@@ -502,13 +868,70 @@ def save_export_state(workspace: str, state: dict):
     """Save export state for resume capability."""
     state_path = get_export_state_path(workspace)
     state["updated_at"] = datetime.now().isoformat()
-    with open(state_path, "w") as f:
-        json.dump(state, f, indent=2)
+    # Counts let export-status report progress without sizing the lists
+    progress = state["thread_progress"]
+    progress["threads_pending_count"] = len(progress["threads_pending"])
+    atomic_write_json(state_path, state)
+
+
+def open_export_data(workspace: str, state: dict, fresh: bool):
+    """
+    Open the export data file for appending.
+
+    Threads and standalone messages are appended here one JSON line each
+    ({"kind": ..., "data": ...}) so checkpoints only rewrite the small state
+    file. Anything written after the last checkpoint is truncated away on
+    resume, since that work will be redone.
+    """
+    data_path = get_export_data_path(workspace)
+    if fresh:
+        data_path.write_bytes(b"")
+    elif data_path.exists():
+        os.truncate(data_path, state.get("data_offset", 0))
+    return open(data_path, "ab")
+
+
+def append_export_record(data_file, kind: str, data: dict):
+    """Append one record to the export data file."""
+    data_file.write(json_dumps_compact({"kind": kind, "data": data}) + b"\n")
+
+
+def iter_export_records(workspace: str, *kinds: str):
+    """Yield the data of every export record of the given kind(s), in file order."""
+    data_path = get_export_data_path(workspace)
+    if not data_path.exists():
+        return
+    with open(data_path, "rb") as f:
+        for line in f:
+            record = json_loads(line)
+            if record["kind"] in kinds:
+                yield record["data"]
+
+
+def load_fetched_threads(workspace: str) -> set:
+    """
+    Rebuild the set of finished thread keys from the export data file.
+
+    Fetched threads are recorded there (as "thread" or "skipped_thread"
+    records) rather than as a list in the state file, so checkpoints don't
+    re-serialise every key.
+    """
+    return {record["thread_id"]
+            for record in iter_export_records(workspace, "thread", "skipped_thread")}
+
+
+def checkpoint_export(workspace: str, state: dict, data_file):
+    """Flush appended records and save state pointing at the end of them."""
+    data_file.flush()
+    state["data_offset"] = data_file.tell()
+    save_export_state(workspace, state)
 
 
 def create_export_state(workspace: str, user_id: str, username: str,
                         from_date: str, to_date: str, output_file: str) -> dict:
     """Create a new export state."""
+    import uuid
+
     return {
         "export_id": str(uuid.uuid4())[:8],
         "workspace": workspace,
@@ -529,14 +952,15 @@ def create_export_state(workspace: str, user_id: str, username: str,
         },
         "thread_progress": {
             "threads_pending": [],
-            "threads_fetched": [],
+            "threads_fetched_count": 0,
             "current_index": 0
         },
         "data": {
             "channels": {},
-            "threads": [],
-            "standalone_messages": []
+            "thread_count": 0,
+            "standalone_count": 0
         },
+        "data_offset": 0,
         "errors": [],
         "stats": {
             "api_calls": 0
@@ -545,10 +969,10 @@ def create_export_state(workspace: str, user_id: str, username: str,
 
 
 def delete_export_state(workspace: str):
-    """Delete export state file after successful completion."""
-    state_path = get_export_state_path(workspace)
-    if state_path.exists():
-        state_path.unlink()
+    """Delete export state and data files after successful completion."""
+    for path in (get_export_state_path(workspace), get_export_data_path(workspace)):
+        if path.exists():
+            path.unlink()
 
 
 # ==================== Export Functions ====================
@@ -562,105 +986,136 @@ def run_export(client: 'SlackClient', workspace: str, from_date: str, to_date: s
     Phase 2: Fetch full thread context for threaded messages
     Phase 3: Write final output file
     """
-    rate_limiter = RateLimiter()
-
-    # Get user info
-    auth = client.auth_test()
-    if not auth.get("ok"):
-        raise Exception(f"Auth failed: {auth.get('error')}")
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    user_id = auth.get("user_id")
-    username = auth.get("user")
+    rate_limiter = RateLimiter()
 
-    # Load or create state
+    # Load saved state before any API call so a missing export fails fast
     state = load_export_state(workspace) if resume else None
+    if resume and not state:
+        raise Exception("No export to resume")
 
     if state and state.get("status") == "completed":
         print(f"Previous export completed. Use without --resume to start fresh.", file=sys.stderr)
         return state
 
-    if not state or not resume:
+    if state and "data_offset" not in state:
+        raise Exception("Export state is from an older version; start a fresh export without --resume")
+
+    # Get user info; a resumed export already has it, and any token problem
+    # surfaces on its first API call anyway
+    if state and state["config"].get("user_id") and state["config"].get("username"):
+        user_id = state["config"]["user_id"]
+        username = state["config"]["username"]
+    else:
+        auth = client.auth_test()
+        if not auth.get("ok"):
+            raise Exception(f"Auth failed: {auth.get('error')}")
+        user_id = auth.get("user_id")
+        username = auth.get("user")
+
+    fresh = not state or not resume
+    if fresh:
         state = create_export_state(workspace, user_id, username, from_date, to_date, output_file)
         save_export_state(workspace, state)
         print(f"Starting export {state['export_id']} for @{username}", file=sys.stderr)
     else:
+        # Dates and output path come from the export being resumed, not the CLI
+        from_date = state["config"]["from_date"]
+        to_date = state["config"]["to_date"]
+        output_file = state["config"]["output_file"]
         print(f"Resuming export {state['export_id']} from {state['status']}", file=sys.stderr)
 
+    data_file = open_export_data(workspace, state, fresh)
+    last_checkpoint = time.monotonic()
+    # Fetches overlap their network latency on a small pool; the shared rate
+    # limiter still caps the call rate. Results are stored and checkpointed
+    # on this thread only.
+    pool = ThreadPoolExecutor(max_workers=EXPORT_FETCH_WORKERS)
+
+    def maybe_checkpoint(force: bool = False):
+        """Checkpoint if forced or the checkpoint interval has elapsed."""
+        nonlocal last_checkpoint
+        now = time.monotonic()
+        if force or now - last_checkpoint >= EXPORT_CHECKPOINT_INTERVAL_SECONDS:
+            checkpoint_export(workspace, state, data_file)
+            last_checkpoint = now
+
     try:
         # ===== PHASE 1: Search for user's messages =====
         if state["status"] == "searching":
             query = f"from:{username} after:{from_date} before:{to_date}"
+            # Next page to fetch; saved after each page so resume never re-adds one
             page = state["search_progress"]["current_page"]
 
             print(f"Phase 1: Searching for messages...", file=sys.stderr)
 
-            while True:
-                rate_limiter.wait_for_tier3()
-                state["stats"]["api_calls"] += 1
+            # Set mirror of threads_pending for O(1) dedup; the list keeps order for the state file
+            pending_set = set(state["thread_progress"]["threads_pending"])
 
-                result = client.search_messages_paginated(query, page=page, count=100)
+            def fetch_page(p: int) -> tuple[dict, int]:
+                return _fetch_with_backoff(
+                    rate_limiter, rate_limiter.wait_for_tier3,
+                    lambda: client.search_messages_paginated(query, page=p, count=100))
 
+            def process_page(p: int, result: dict, calls: int) -> int:
+                """Store one page's matches in page order; returns the total page count."""
+                state["stats"]["api_calls"] += calls
                 if not result.get("ok"):
-                    error = result.get("error", "unknown")
-                    if error == "ratelimited":
-                        rate_limiter.handle_rate_limit_response()
-                        continue
-                    raise Exception(f"Search failed: {error}")
-
-                rate_limiter.reset_backoff()
+                    raise Exception(f"Search failed: {result.get('error', 'unknown')}")
 
                 messages_data = result.get("messages", {})
                 matches = messages_data.get("matches", [])
                 total = messages_data.get("total", 0)
-                paging = messages_data.get("paging", {})
+                pages = messages_data.get("paging", {}).get("pages", 1)
 
-                # Process messages from this page
                 for msg in matches:
-                    _process_search_result(msg, state)
+                    _process_search_result(msg, state, pending_set, data_file)
 
                 state["search_progress"]["total_matches"] = total
                 state["search_progress"]["messages_fetched"] += len(matches)
-                state["search_progress"]["current_page"] = page
+                state["search_progress"]["current_page"] = p + 1
 
-                print(f"  Page {page}/{paging.get('pages', 1)}: "
+                print(f"  Page {p}/{pages}: "
                       f"{state['search_progress']['messages_fetched']}/{total} messages",
                       file=sys.stderr)
 
-                save_export_state(workspace, state)
-
-                # Check if done with search
-                if page >= paging.get("pages", 1):
-                    break
+                maybe_checkpoint()
+                return pages
 
-                page += 1
+            # The first page gives the page count; the rest are fetched
+            # concurrently and processed in order
+            pages = process_page(page, *fetch_page(page))
+            remaining = range(page + 1, pages + 1)
+            futures = [pool.submit(fetch_page, p) for p in remaining]
+            for p, future in zip(remaining, futures):
+                process_page(p, *future.result())
 
             state["status"] = "fetching_threads"
-            save_export_state(workspace, state)
+            maybe_checkpoint(force=True)
 
         # ===== PHASE 2: Fetch thread context =====
         if state["status"] == "fetching_threads":
-            pending = state["thread_progress"]["threads_pending"]
-            fetched = set(state["thread_progress"]["threads_fetched"])
-            to_fetch = [t for t in pending if t not in fetched]
+            # Finished threads are only looked up when resuming part-way through
+            progress = state["thread_progress"]
+            fetched = load_fetched_threads(workspace) if progress["threads_fetched_count"] else set()
+            to_fetch = [t for t in dict.fromkeys(progress["threads_pending"]) if t not in fetched]
 
             print(f"Phase 2: Fetching {len(to_fetch)} threads...", file=sys.stderr)
 
-            for i, thread_key in enumerate(to_fetch):
-                channel_id, thread_ts = thread_key.split(":")
-
-                rate_limiter.wait_for_tier4()
-                state["stats"]["api_calls"] += 1
-
-                result = client.conversations_replies(channel_id, thread_ts)
+            futures = {pool.submit(_fetch_thread, client, rate_limiter, thread_key): thread_key
+                       for thread_key in to_fetch}
+            for i, future in enumerate(as_completed(futures)):
+                thread_key = futures[future]
+                result, calls = future.result()
+                state["stats"]["api_calls"] += calls
 
                 if not result.get("ok"):
                     error = result.get("error", "unknown")
-                    if error == "ratelimited":
-                        rate_limiter.handle_rate_limit_response()
-                        continue
-                    elif error in ("thread_not_found", "channel_not_found", "not_in_channel"):
+                    if error in ("thread_not_found", "channel_not_found", "not_in_channel"):
                         # Skip inaccessible threads
-                        state["thread_progress"]["threads_fetched"].append(thread_key)
+                        progress["threads_fetched_count"] += 1
+                        append_export_record(data_file, "skipped_thread", {"thread_id": thread_key})
                         state["errors"].append({
                             "timestamp": datetime.now().isoformat(),
                             "type": error,
@@ -669,20 +1124,18 @@ def run_export(client: 'SlackClient', workspace: str, from_date: str, to_date: s
                         continue
                     raise Exception(f"Thread fetch failed: {error}")
 
-                rate_limiter.reset_backoff()
-
                 # Store thread data
                 thread_messages = result.get("messages", [])
-                _store_thread_data(thread_key, thread_messages, state)
-                state["thread_progress"]["threads_fetched"].append(thread_key)
-                state["thread_progress"]["current_index"] = i + 1
+                _store_thread_data(thread_key, thread_messages, state, data_file)
+                progress["threads_fetched_count"] += 1
+                progress["current_index"] = i + 1
 
                 if (i + 1) % 10 == 0:
                     print(f"  Threads: {i + 1}/{len(to_fetch)}", file=sys.stderr)
-                    save_export_state(workspace, state)
+                maybe_checkpoint()
 
             state["status"] = "writing_output"
-            save_export_state(workspace, state)
+            maybe_checkpoint(force=True)
 
         # ===== PHASE 3: Write output file =====
         if state["status"] == "writing_output":
@@ -695,8 +1148,8 @@ def run_export(client: 'SlackClient', workspace: str, from_date: str, to_date: s
 
             print(f"\nExport complete!", file=sys.stderr)
             print(f"  Messages: {state['search_progress']['messages_fetched']}", file=sys.stderr)
-            print(f"  Threads: {len(state['data']['threads'])}", file=sys.stderr)
-            print(f"  Standalone: {len(state['data']['standalone_messages'])}", file=sys.stderr)
+            print(f"  Threads: {state['data']['thread_count']}", file=sys.stderr)
+            print(f"  Standalone: {state['data']['standalone_count']}", file=sys.stderr)
             print(f"  Output: {state['config']['output_file']}", file=sys.stderr)
 
         return state
@@ -704,7 +1157,7 @@ def run_export(client: 'SlackClient', workspace: str, from_date: str, to_date: s
     except KeyboardInterrupt:
         print(f"\nExport paused. Run with --resume to continue.", file=sys.stderr)
         state["status"] = "paused"
-        save_export_state(workspace, state)
+        checkpoint_export(workspace, state, data_file)
         raise
     except Exception as e:
         state["errors"].append({
@@ -712,26 +1165,80 @@ def run_export(client: 'SlackClient', workspace: str, from_date: str, to_date: s
             "type": type(e).__name__,
             "details": str(e)
         })
-        save_export_state(workspace, state)
+        checkpoint_export(workspace, state, data_file)
         raise
+    finally:
+        # Don't start queued fetches after an error or Ctrl+C, wake workers
+        # sleeping in the rate limiter so they give up, and don't wait for them
+        rate_limiter.stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        data_file.close()
 
 
-def _process_search_result(msg: dict, state: dict):
-    """Process a message from search results."""
-    channel_info = msg.get("channel", {})
-    channel_id = channel_info.get("id")
-    message_ts = msg.get("ts")
-    thread_ts = msg.get("thread_ts")
-    user_id = state["config"]["user_id"]
+def _fetch_with_backoff(rate_limiter: RateLimiter, wait, fetch) -> tuple[dict, int]:
+    """
+    Call fetch() after wait(), retrying after rate-limit backoffs.
+
+    Runs on export worker threads, so it must not touch export state.
+    Gives up without calling the API once rate_limiter.stop is set.
+
+    Returns:
+        (API response, number of API calls made)
+    """
+    calls = 0
+    while True:
+        if rate_limiter.stop.is_set():
+            return {"ok": False, "error": "cancelled"}, calls
+        wait()
+        if rate_limiter.stop.is_set():  # Set while we slept
+            return {"ok": False, "error": "cancelled"}, calls
+        calls += 1
+        result = fetch()
+        if result.get("error") != "ratelimited":
+            break
+        rate_limiter.handle_rate_limit_response(result.get("retry_after"))
+
+    if result.get("ok"):
+        rate_limiter.reset_backoff()
+    return result, calls
+
+
+def _fetch_thread(client: 'SlackClient', rate_limiter: RateLimiter,
+                  thread_key: str) -> tuple[dict, int]:
+    """Fetch one thread's replies (see _fetch_with_backoff)."""
+    channel_id, thread_ts = thread_key.split(":")
+    return _fetch_with_backoff(rate_limiter, rate_limiter.wait_for_tier4,
+                               lambda: client.conversations_replies(channel_id, thread_ts))
+
+
+def _search_match_thread_ts(msg: dict):
+    """
+    Parent thread ts of a search match, or None if it isn't a thread reply.
 
-    # Check permalink for thread_ts if not in message directly
-    # Permalink format: .../p1234567890123456?thread_ts=1234567890.123456
+    Search matches often omit thread_ts, so fall back to the permalink
+    (format: .../p1234567890123456?thread_ts=1234567890.123456).
+    """
+    thread_ts = msg.get("thread_ts")
     if not thread_ts:
         permalink = msg.get("permalink", "")
         if "thread_ts=" in permalink:
-            match = re.search(r'thread_ts=(\d+\.\d+)', permalink)
+            match = _THREAD_TS_RE.search(permalink)
             if match:
                 thread_ts = match.group(1)
+    return thread_ts
+
+
+def _process_search_result(msg: dict, state: dict, pending_set: set, data_file):
+    """
+    Process a message from search results.
+
+    pending_set mirrors state["thread_progress"]["threads_pending"] for fast
+    membership checks and is updated alongside it.
+    """
+    channel_info = msg.get("channel", {})
+    channel_id = channel_info.get("id")
+    message_ts = msg.get("ts")
+    thread_ts = _search_match_thread_ts(msg)
 
     # Store channel metadata
     if channel_id and channel_id not in state["data"]["channels"]:
@@ -744,21 +1251,22 @@ def _process_search_result(msg: dict, state: dict):
     if thread_ts:
         # Message is part of a thread
         thread_key = f"{channel_id}:{thread_ts}"
-        if thread_key not in state["thread_progress"]["threads_pending"]:
+        if thread_key not in pending_set:
+            pending_set.add(thread_key)
             state["thread_progress"]["threads_pending"].append(thread_key)
     else:
         # Standalone message
-        state["data"]["standalone_messages"].append({
+        state["data"]["standalone_count"] += 1
+        append_export_record(data_file, "standalone_message", {
             "ts": message_ts,
             "channel_id": channel_id,
             "user": msg.get("user") or msg.get("username"),
             "text": msg.get("text", ""),
-            "is_user_message": True,
             "permalink": msg.get("permalink")
         })
 
 
-def _store_thread_data(thread_key: str, messages: list, state: dict):
+def _store_thread_data(thread_key: str, messages: list, state: dict, data_file):
     """Store thread messages."""
     channel_id, thread_ts = thread_key.split(":")
     user_id = state["config"]["user_id"]
@@ -772,30 +1280,28 @@ def _store_thread_data(thread_key: str, messages: list, state: dict):
         "messages": []
     }
 
+    # is_user_message is derived from "user" at write time rather than stored
     for msg in messages:
-        is_user = msg.get("user") == user_id
-        if is_user:
+        if msg.get("user") == user_id:
             thread_data["user_message_count"] += 1
 
         thread_data["messages"].append({
             "ts": msg.get("ts"),
             "user": msg.get("user"),
-            "text": msg.get("text", ""),
-            "is_user_message": is_user
+            "text": msg.get("text", "")
         })
 
-    state["data"]["threads"].append(thread_data)
+    state["data"]["thread_count"] += 1
+    append_export_record(data_file, "thread", thread_data)
+
+
+# Conversation type by channel ID prefix
+_CHANNEL_TYPE_BY_PREFIX = {"C": "channel", "D": "dm", "G": "group"}
 
 
 def _infer_channel_type(channel_id: str) -> str:
     """Infer channel type from ID prefix."""
-    if channel_id.startswith("C"):
-        return "channel"
-    elif channel_id.startswith("D"):
-        return "dm"
-    elif channel_id.startswith("G"):
-        return "group"
-    return "unknown"
+    return _CHANNEL_TYPE_BY_PREFIX.get(channel_id[:1], "unknown")
 
 
 def _write_export_file(state: dict, workspace: str):
@@ -803,73 +1309,411 @@ def _write_export_file(state: dict, workspace: str):
     # Get user lookup from cache
     user_lookup = get_user_lookup(workspace)
 
-    output = {
-        "metadata": {
-            "export_id": state["export_id"],
-            "workspace": workspace,
-            "user": {
-                "id": state["config"]["user_id"],
-                "username": state["config"]["username"]
-            },
-            "date_range": {
-                "from": state["config"]["from_date"],
-                "to": state["config"]["to_date"]
-            },
-            "exported_at": datetime.now().isoformat(),
-            "stats": {
-                "total_messages": state["search_progress"]["messages_fetched"],
-                "total_threads": len(state["data"]["threads"]),
-                "standalone_messages": len(state["data"]["standalone_messages"]),
-                "channels_count": len(state["data"]["channels"]),
-                "api_calls": state["stats"]["api_calls"]
-            }
+    metadata = {
+        "export_id": state["export_id"],
+        "workspace": workspace,
+        "user": {
+            "id": state["config"]["user_id"],
+            "username": state["config"]["username"]
         },
-        "users": user_lookup,  # Include user ID -> display name mapping
-        "channels": state["data"]["channels"],
-        "threads": state["data"]["threads"],
-        "standalone_messages": state["data"]["standalone_messages"]
+        "date_range": {
+            "from": state["config"]["from_date"],
+            "to": state["config"]["to_date"]
+        },
+        "exported_at": datetime.now().isoformat(),
+        "stats": {
+            "total_messages": state["search_progress"]["messages_fetched"],
+            "total_threads": state["data"]["thread_count"],
+            "standalone_messages": state["data"]["standalone_count"],
+            "channels_count": len(state["data"]["channels"]),
+            "api_calls": state["stats"]["api_calls"]
+        }
     }
 
     output_path = Path(state["config"]["output_file"]).expanduser()
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    # Stream the bulk arrays from the data file one record per line rather
+    # than serialising one giant document, so peak memory stays flat
+    with open(output_path, "wb") as f:
+        f.write(b'{\n"metadata": ' + json_dumps_compact(metadata))
+        f.write(b',\n"users": ' + json_dumps_compact(user_lookup))  # user ID -> display name
+        f.write(b',\n"channels": ' + json_dumps_compact(state["data"]["channels"]))
+        _write_json_array(f, "threads", _iter_output_threads(workspace, state["config"]["user_id"]))
+        _write_json_array(f, "standalone_messages", _iter_output_standalone(workspace))
+        f.write(b"\n}\n")
+
+
+def _iter_output_threads(workspace: str, user_id: str):
+    """Yield stored threads with each message's is_user_message flag filled in."""
+    for thread in iter_export_records(workspace, "thread"):
+        for msg in thread["messages"]:
+            msg["is_user_message"] = msg["user"] == user_id
+        yield thread
+
+
+def _iter_output_standalone(workspace: str):
+    """Yield stored standalone messages, which are all the user's own."""
+    for msg in iter_export_records(workspace, "standalone_message"):
+        msg["is_user_message"] = True
+        yield msg
+
+
+def _write_json_array(f, key: str, items) -> None:
+    """Write ',"key": [...]' to a binary file, one compact item per line."""
+    f.write(f',\n"{key}": ['.encode())
+    for i, item in enumerate(items):
+        f.write(b",\n" if i else b"\n")
+        f.write(json_dumps_compact(item))
+    f.write(b"\n]")
+
+
+# ==================== History Functions ====================
+
+def fetch_all_history(client: 'SlackClient', channel: str, max_pages: int = None,
+                      fields: tuple[str, ...] = None) -> dict:
+    """
+    Fetch a channel's full history by following pagination cursors.
+
+    Pages are fetched back-to-back on the client's keep-alive session.
+    Slack cursors are only known once the previous page arrives, so pages
+    can't be requested concurrently.
+
+    Args:
+        client: SlackClient for the workspace
+        channel: Channel ID
+        max_pages: Optional cap on the number of pages (200 messages each)
+        fields: Optional message keys to keep (see conversations_history)
+
+    Returns:
+        dict with 'messages' (newest first), 'pages' and 'has_more'
+    """
+    rate_limiter = RateLimiter()
+    messages = []
+    cursor = None
+    pages = 0
+
+    while max_pages is None or pages < max_pages:
+        # conversations.history is Tier 3 for most apps
+        rate_limiter.wait_for_tier3()
+        result = client.conversations_history(channel, 200, fields, cursor)
+
+        if not result.get("ok"):
+            error = result.get("error", "unknown")
+            if error == "ratelimited":
+                rate_limiter.handle_rate_limit_response(result.get("retry_after"))
+                continue
+            return result
+
+        rate_limiter.reset_backoff()
+        pages += 1
+        messages.extend(result.get("messages", []))
+        print(f"  Page {pages}: {len(messages)} messages", file=sys.stderr)
+
+        cursor = result.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            break
+
+    return {
+        "ok": True,
+        "messages": messages,
+        "pages": pages,
+        "has_more": bool(cursor)
+    }
 
 
 # ==================== Digest Functions ====================
 
 def load_digest_config() -> dict:
-    """Load the digest configuration."""
-    if not DIGEST_CONFIG_PATH.exists():
+    """Load the digest configuration (cached in-process until the file changes)."""
+    mtime = _mtime_ns(DIGEST_CONFIG_PATH)
+    if mtime is None:
         return {
             "workspaces": {},
             "lookback_hours": 14,
             "output_dir": str(SKILL_ROOT / "digests")
         }
-    with open(DIGEST_CONFIG_PATH) as f:
-        return json.load(f)
+    if _DIGEST_CONFIG_CACHE["data"] is None or _DIGEST_CONFIG_CACHE["mtime"] != mtime:
+        _DIGEST_CONFIG_CACHE["data"] = read_json(DIGEST_CONFIG_PATH)
+        _DIGEST_CONFIG_CACHE["mtime"] = mtime
+    return _DIGEST_CONFIG_CACHE["data"]
 
 
-def run_digest(workspace: str = None) -> dict:
-    """
-    Generate an overnight digest for one or all workspaces.
+def _section_block_text(blocks: list | None) -> str:
+    """Text of the first non-empty section block (bots/apps often leave "text" empty)."""
+    for block in blocks or ():
+        if block.get("type") == "section":
+            block_text = block.get("text", {})
+            text = block_text.get("text", "") if isinstance(block_text, dict) else str(block_text)
+            if text:
+                return text
+    return ""
 
-    Returns a structured digest with:
-    - mentions: Messages mentioning the user
-    - replies: Replies to user's recent messages
-    - channel_activity: Summary of channel activity
 
-    Args:
-        workspace: Specific workspace to digest, or None for all configured workspaces
+def _iter_digest_search(client: 'SlackClient', rate_limiter: RateLimiter, query: str,
+                        oldest_ts: float = None):
     """
-    digest_config = load_digest_config()
-    full_config = load_full_config()
-    lookback_hours = digest_config.get("lookback_hours", 14)
+    Yield search matches for a digest query, newest first, across pages.
 
-    # Calculate time range
+    Stops after the last page, a failed search, or DIGEST_SEARCH_MAX_PAGES.
+    If oldest_ts is given, also stops at the first match older than it:
+    results are sorted newest first, so no later match can be newer.
+    """
+    for page in range(1, DIGEST_SEARCH_MAX_PAGES + 1):
+        result, _ = _fetch_with_backoff(
+            rate_limiter, rate_limiter.wait_for_tier3,
+            lambda: client.search_messages(query, count=100, page=page))
+        if not result.get("ok"):
+            print(f"  Search failed: {result.get('error', 'unknown')}", file=sys.stderr)
+            return
+
+        messages_data = result.get("messages", {})
+        matches = messages_data.get("matches", [])
+        for msg in matches:
+            if oldest_ts is not None and float(msg.get("ts", 0)) < oldest_ts:
+                return
+            yield msg
+
+        if len(matches) < 100 or page >= messages_data.get("paging", {}).get("pages", 1):
+            return
+
+
+def _fetch_digest_threads(client: 'SlackClient', rate_limiter: RateLimiter,
+                          thread_keys) -> dict:
+    """
+    Fetch conversations.replies for each (channel_id, thread_ts) concurrently.
+
+    The shared rate limiter still paces the calls. Once Slack answers
+    "ratelimited", no further fetches are started; threads that were not
+    fetched are simply missing from the result.
+
+    Returns:
+        Dict of (channel_id, thread_ts) -> API response
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    results = {}
+    stop = threading.Event()
+
+    def fetch(key: tuple) -> dict:
+        if stop.is_set():
+            return {"ok": False, "error": "ratelimited"}
+        rate_limiter.wait_for_tier4()
+        return client.conversations_replies(*key)
+
+    with ThreadPoolExecutor(max_workers=DIGEST_FETCH_WORKERS) as pool:
+        futures = {pool.submit(fetch, key): key
+                   for key in thread_keys}
+        for future in as_completed(futures):
+            result = future.result()
+            if result.get("error") == "ratelimited":
+                if not stop.is_set():
+                    stop.set()
+                    print("  Rate limited; skipping remaining thread fetches", file=sys.stderr)
+                    for pending in futures:
+                        pending.cancel()
+                continue
+            results[futures[future]] = result
+    return results
+
+
+def _digest_workspace(ws_name: str, creds: dict, ws_config: dict, result: dict,
+                      rate_limiter: RateLimiter, seen_message_ids: set,
+                      from_time_ts: float, search_date: str):
+    """
+    Add one workspace's mentions and thread replies to a digest.
+
+    Args:
+        ws_name: Workspace name
+        creds: The workspace's credentials from config.json
+        ws_config: The workspace's digest settings (may be empty)
+        result: Digest being built by run_digest (updated in place)
+        rate_limiter: Shared across workspaces
+        seen_message_ids: (channel_id, ts) pairs already in the digest
+        from_time_ts: Start of the lookback period (epoch seconds)
+        search_date: Day before the lookback start, for Slack's after: modifier
+    """
+    client = SlackClient(
+        creds["xoxc_token"],
+        creds["xoxd_token"],
+        creds.get("user_agent")
+    )
+
+    # Get current user info
+    auth_result = cached_auth_test(client, ws_name)
+    if not auth_result.get("ok"):
+        print(f"  Auth failed for {ws_name}: {auth_result.get('error')}", file=sys.stderr)
+        return
+
+    user_id = auth_result.get("user_id")
+    username = auth_result.get("user")
+
+    # Ensure user cache is populated before looking up names
+    cache = load_cache(ws_name)
+    if is_user_cache_empty(ws_name, cache):
+        print(f"  User cache empty. Fetching users from {ws_name}...", file=sys.stderr)
+        fetch_and_cache_users(client, ws_name)
+        cache = load_cache(ws_name)
+
+    # Get user lookup for name resolution
+    user_lookup = get_user_lookup(ws_name, cache)
+
+    summary = result["summary"]
+
+    # (mention entry, thread key, mention ts); handled is decided from
+    # the threads fetched in phase 2 rather than one fetch per mention
+    ws_mentions = []
+    # (channel_id, thread_ts) -> user's last message ts in that thread
+    user_reply_ts_by_thread = {}
+
+    # 1. Search for mentions of this user
+    if ws_config.get("include_mentions", True):
+        print(f"  Searching for mentions...", file=sys.stderr)
+
+        # Search for @mentions within the lookback period
+        mention_query = f"<@{user_id}> after:{search_date}"
+        for msg in _iter_digest_search(client, rate_limiter, mention_query,
+                                       oldest_ts=from_time_ts):
+            msg_id = (msg.get("channel", {}).get("id"), msg.get("ts"))
+            if msg_id in seen_message_ids:
+                continue
+            seen_message_ids.add(msg_id)
+
+            # Skip if it's the user's own message
+            if msg.get("user") == user_id or msg.get("username") == username:
+                continue
+
+            sender_id = msg.get("user") or msg.get("username")
+            sender_name = user_lookup.get(sender_id, sender_id)
+            channel_info = msg.get("channel", {})
+            mention_ts = float(msg.get("ts", 0))
+
+            thread_ts = _search_match_thread_ts(msg) or msg.get("ts")
+            channel_id = channel_info.get("id")
+
+            # Get text from message, falling back to blocks if text is empty
+            msg_text = msg.get("text", "")
+            if not msg_text.strip():
+                msg_text = _section_block_text(msg.get("blocks")) or msg_text
+
+            entry = {
+                "workspace": ws_name,
+                "channel": channel_info.get("name", "unknown"),
+                "channel_id": channel_id,
+                "from": sender_name,
+                "from_id": sender_id,
+                "text": msg_text[:DIGEST_TEXT_MAX_CHARS],  # Truncate long messages
+                "ts": msg.get("ts"),
+                "permalink": msg.get("permalink"),
+                "handled": False  # Set below if user already replied after this mention
+            }
+            result["mentions"].append(entry)
+            summary["total_mentions"] += 1
+            # Counted as unhandled until phase 2 finds a later reply
+            summary["unhandled_mentions"] += 1
+            ws_mentions.append((entry, (channel_id, thread_ts), mention_ts))
+
+    # 2. Search for thread activity where user participated
+    # This covers threads user started OR replied to
+    print(f"  Searching for thread activity...", file=sys.stderr)
+
+    # Find threads user participated in by searching for their messages
+    user_msg_query = f"from:{username} after:{search_date}"
+
+    # (channel_id, thread_ts) -> channel name, in search order
+    user_threads = {}
+    for msg in _iter_digest_search(client, rate_limiter, user_msg_query):
+        # Get thread_ts - either this message is in a thread, or it started one
+        thread_ts = _search_match_thread_ts(msg) or msg.get("ts")
+        channel_id = msg.get("channel", {}).get("id")
+
+        if not channel_id or not thread_ts:
+            continue
+
+        thread_key = (channel_id, thread_ts)
+        if thread_key not in user_threads:
+            user_threads[thread_key] = msg.get("channel", {}).get("name", "unknown")
+
+    # Fetch the full threads
+    threads = _fetch_digest_threads(client, rate_limiter, user_threads)
+
+    for (channel_id, thread_ts), channel_name in user_threads.items():
+        replies_result = threads.get((channel_id, thread_ts))
+
+        if not replies_result or not replies_result.get("ok"):
+            continue
+
+        # One pass: track the user's last message ts and keep
+        # recent messages from others
+        user_last_ts = 0.0
+        recent = []
+        for tmsg in replies_result.get("messages", []):
+            tmsg_ts = float(tmsg.get("ts", 0))
+            if tmsg.get("user") == user_id:
+                if tmsg_ts > user_last_ts:
+                    user_last_ts = tmsg_ts
+            elif (tmsg_ts >= from_time_ts  # Within lookback period
+                  and tmsg.get("subtype") not in _SYSTEM_SUBTYPES):
+                recent.append(tmsg)
+        user_reply_ts_by_thread[(channel_id, thread_ts)] = user_last_ts
+
+        for tmsg in recent:
+            msg_id = (channel_id, tmsg.get("ts"))
+            if msg_id in seen_message_ids:
+                continue
+            seen_message_ids.add(msg_id)
+
+            sender_id = tmsg.get("user")
+            sender_name = user_lookup.get(sender_id, sender_id)
+            msg_text = tmsg.get("text", "")
+
+            # Skip empty messages
+            if not msg_text.strip():
+                continue
+
+            result["replies"].append({
+                "workspace": ws_name,
+                "channel": channel_name,
+                "channel_id": channel_id,
+                "from": sender_name,
+                "from_id": sender_id,
+                "text": msg_text[:DIGEST_TEXT_MAX_CHARS],
+                "ts": tmsg.get("ts"),
+                "thread_ts": thread_ts
+            })
+            summary["total_replies"] += 1
+
+    # 3. A mention is handled if the user posted in its thread after it.
+    # Threads the user never posted in weren't fetched and stay unhandled.
+    for entry, key, mention_ts in ws_mentions:
+        if user_reply_ts_by_thread.get(key, 0) > mention_ts:
+            entry["handled"] = True
+            summary["unhandled_mentions"] -= 1
+
+    # Note: Channel activity scanning removed - focus on mentions and thread replies
+    # which mirrors Slack's Activity screen behaviour
+
+
+def run_digest(workspace: str = None) -> dict:
+    """
+    Generate an overnight digest for one or all workspaces.
+
+    Returns a structured digest with:
+    - mentions: Messages mentioning the user
+    - replies: Replies to user's recent messages
+    - channel_activity: Summary of channel activity
+
+    Args:
+        workspace: Specific workspace to digest, or None for all configured workspaces
+    """
+    digest_config = load_digest_config()
+    full_config = load_full_config()
+    lookback_hours = digest_config.get("lookback_hours", 14)
+
+    # Calculate time range
     now = datetime.now()
     from_time = now - timedelta(hours=lookback_hours)
+    from_time_ts = from_time.timestamp()
 
     # Convert to Slack search date format (YYYY-MM-DD)
     # Slack's "after:" filter is day-granularity, so we search from a day earlier
@@ -893,212 +1737,33 @@ def run_digest(workspace: str = None) -> dict:
         "replies": []
     }
 
+    configured = full_config.get("workspaces", {})
+    digest_workspaces = digest_config.get("workspaces", {})
+
     # Determine which workspaces to process
     if workspace:
         workspaces_to_process = [workspace]
     else:
-        workspaces_to_process = list(digest_config.get("workspaces", {}).keys())
+        workspaces_to_process = list(digest_workspaces)
 
     if not workspaces_to_process:
         # Fall back to all configured workspaces in main config
-        workspaces_to_process = list(full_config.get("workspaces", {}).keys())
+        workspaces_to_process = list(configured)
 
     rate_limiter = RateLimiter()
-    seen_message_ids = set()  # For deduplication
+    seen_message_ids = set()  # (channel_id, ts) pairs, for deduplication
 
     for ws_name in workspaces_to_process:
-        if ws_name not in full_config.get("workspaces", {}):
+        if ws_name not in configured:
             print(f"  Skipping unknown workspace: {ws_name}", file=sys.stderr)
             continue
 
         print(f"Processing workspace: {ws_name}", file=sys.stderr)
 
         try:
-            creds = full_config["workspaces"][ws_name]
-            client = SlackClient(
-                creds["xoxc_token"],
-                creds["xoxd_token"],
-                creds.get("user_agent")
-            )
-
-            # Get current user info
-            auth_result = client.auth_test()
-            if not auth_result.get("ok"):
-                print(f"  Auth failed for {ws_name}: {auth_result.get('error')}", file=sys.stderr)
-                continue
-
-            user_id = auth_result.get("user_id")
-            username = auth_result.get("user")
-
-            # Ensure user cache is populated before looking up names
-            if is_user_cache_empty(ws_name):
-                print(f"  User cache empty. Fetching users from {ws_name}...", file=sys.stderr)
-                fetch_and_cache_users(client, ws_name)
-
-            # Get user lookup for name resolution
-            user_lookup = get_user_lookup(ws_name)
-
-            ws_config = digest_config.get("workspaces", {}).get(ws_name, {})
-
-            # 1. Search for mentions of this user
-            if ws_config.get("include_mentions", True):
-                print(f"  Searching for mentions...", file=sys.stderr)
-                rate_limiter.wait_for_tier3()
-
-                # Search for @mentions
-                mention_query = f"<@{user_id}> after:{search_date}"
-                mention_result = client.search_messages(mention_query, count=50)
-
-                if mention_result.get("ok"):
-                    matches = mention_result.get("messages", {}).get("matches", [])
-                    for msg in matches:
-                        msg_id = f"{msg.get('channel', {}).get('id')}:{msg.get('ts')}"
-                        if msg_id in seen_message_ids:
-                            continue
-                        seen_message_ids.add(msg_id)
-
-                        # Skip if it's the user's own message
-                        if msg.get("user") == user_id or msg.get("username") == username:
-                            continue
-
-                        sender_id = msg.get("user") or msg.get("username")
-                        sender_name = user_lookup.get(sender_id, sender_id)
-                        channel_info = msg.get("channel", {})
-                        mention_ts = float(msg.get("ts", 0))
-
-                        # Check if user has already replied to this thread
-                        user_replied = False
-                        thread_ts = msg.get("thread_ts") or msg.get("ts")
-                        channel_id = channel_info.get("id")
-
-                        if channel_id and thread_ts:
-                            # Fetch the thread to check for user's reply
-                            rate_limiter.wait_for_tier4()
-                            thread_result = client.conversations_replies(channel_id, thread_ts)
-                            if thread_result.get("ok"):
-                                thread_messages = thread_result.get("messages", [])
-                                for tmsg in thread_messages:
-                                    if tmsg.get("user") == user_id:
-                                        reply_ts = float(tmsg.get("ts", 0))
-                                        if reply_ts > mention_ts:
-                                            user_replied = True
-                                            break
-
-                        # Get text from message, falling back to blocks if text is empty
-                        msg_text = msg.get("text", "")
-                        if not msg_text.strip():
-                            # Try to get text from blocks (used by bots/apps)
-                            blocks = msg.get("blocks", [])
-                            for block in blocks:
-                                if block.get("type") == "section":
-                                    block_text = block.get("text", {})
-                                    if isinstance(block_text, dict):
-                                        msg_text = block_text.get("text", "")
-                                    else:
-                                        msg_text = str(block_text)
-                                    if msg_text:
-                                        break
-
-                        result["mentions"].append({
-                            "workspace": ws_name,
-                            "channel": channel_info.get("name", "unknown"),
-                            "channel_id": channel_id,
-                            "from": sender_name,
-                            "from_id": sender_id,
-                            "text": msg_text[:500],  # Truncate long messages
-                            "ts": msg.get("ts"),
-                            "permalink": msg.get("permalink"),
-                            "handled": user_replied  # True if user already replied after this mention
-                        })
-                        result["summary"]["total_mentions"] += 1
-                        if not user_replied:
-                            result["summary"]["unhandled_mentions"] += 1
-
-            # 2. Search for thread activity where user participated
-            # This covers threads user started OR replied to
-            print(f"  Searching for thread activity...", file=sys.stderr)
-
-            # Find threads user participated in by searching for their messages
-            rate_limiter.wait_for_tier3()
-            user_msg_query = f"from:{username} after:{search_date}"
-            user_msg_result = client.search_messages(user_msg_query, count=50)
-
-            threads_checked = set()
-
-            if user_msg_result.get("ok"):
-                user_messages = user_msg_result.get("messages", {}).get("matches", [])
-
-                for msg in user_messages:
-                    # Get thread_ts - either this message is in a thread, or it started one
-                    thread_ts = msg.get("thread_ts") or msg.get("ts")
-                    channel_id = msg.get("channel", {}).get("id")
-                    channel_name = msg.get("channel", {}).get("name", "unknown")
-
-                    if not channel_id or not thread_ts:
-                        continue
-
-                    thread_key = f"{channel_id}:{thread_ts}"
-                    if thread_key in threads_checked:
-                        continue
-                    threads_checked.add(thread_key)
-
-                    # Fetch the full thread
-                    rate_limiter.wait_for_tier4()
-                    replies_result = client.conversations_replies(channel_id, thread_ts)
-
-                    if not replies_result.get("ok"):
-                        continue
-
-                    thread_messages = replies_result.get("messages", [])
-
-                    # Find user's last message timestamp in this thread
-                    user_last_ts = 0
-                    for tmsg in thread_messages:
-                        if tmsg.get("user") == user_id:
-                            user_last_ts = max(user_last_ts, float(tmsg.get("ts", 0)))
-
-                    # Find all recent messages from others in this thread
-                    for tmsg in thread_messages:
-                        if tmsg.get("user") == user_id:
-                            continue  # Skip user's own messages
-
-                        tmsg_ts = float(tmsg.get("ts", 0))
-
-                        # Only include if within lookback period
-                        msg_time = datetime.fromtimestamp(tmsg_ts)
-                        if msg_time < from_time:
-                            continue
-
-                        msg_id = f"{channel_id}:{tmsg.get('ts')}"
-                        if msg_id in seen_message_ids:
-                            continue
-                        seen_message_ids.add(msg_id)
-
-                        sender_id = tmsg.get("user")
-                        sender_name = user_lookup.get(sender_id, sender_id)
-                        msg_text = tmsg.get("text", "")
-
-                        # Skip empty/system messages
-                        if not msg_text.strip():
-                            continue
-                        if " has joined the channel" in msg_text or " has left the channel" in msg_text:
-                            continue
-
-                        result["replies"].append({
-                            "workspace": ws_name,
-                            "channel": channel_name,
-                            "channel_id": channel_id,
-                            "from": sender_name,
-                            "from_id": sender_id,
-                            "text": msg_text[:500],
-                            "ts": tmsg.get("ts"),
-                            "thread_ts": thread_ts
-                        })
-                        result["summary"]["total_replies"] += 1
-
-            # Note: Channel activity scanning removed - focus on mentions and thread replies
-            # which mirrors Slack's Activity screen behaviour
-
+            _digest_workspace(ws_name, configured[ws_name], digest_workspaces.get(ws_name, {}),
+                              result, rate_limiter, seen_message_ids,
+                              from_time_ts, search_date)
         except Exception as e:
             print(f"  Error processing {ws_name}: {e}", file=sys.stderr)
             continue
@@ -1129,8 +1794,7 @@ def write_digest_output(digest: dict, output_dir: str = None) -> str:
     filename = f"slack-digest-{date_str}.json"
     filepath = output_path / filename
 
-    with open(filepath, "w") as f:
-        json.dump(digest, f, indent=2)
+    atomic_write_json(filepath, digest)
 
     return str(filepath)
 
@@ -1138,17 +1802,22 @@ def write_digest_output(digest: dict, output_dir: str = None) -> str:
 # ==================== Config Management ====================
 
 def load_full_config() -> dict:
-    """Load the full config file."""
-    if not CONFIG_PATH.exists():
+    """Load the full config file (cached in-process until the file changes)."""
+    mtime = _mtime_ns(CONFIG_PATH)
+    if mtime is None:
         raise FileNotFoundError(f"Config not found: {CONFIG_PATH}")
-    with open(CONFIG_PATH) as f:
-        return json.load(f)
+    if _CONFIG_CACHE["data"] is None or _CONFIG_CACHE["mtime"] != mtime:
+        _CONFIG_CACHE["data"] = read_json(CONFIG_PATH)
+        _CONFIG_CACHE["mtime"] = mtime
+    return _CONFIG_CACHE["data"]
 
 
 def save_config(config: dict):
     """Save the config file."""
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(config, f, indent=2)
+    atomic_write_json(CONFIG_PATH, config)
+    # What we just wrote is current; don't re-read it on the next load
+    _CONFIG_CACHE["data"] = config
+    _CONFIG_CACHE["mtime"] = CONFIG_PATH.stat().st_mtime_ns
 
 
 def load_config(workspace: str = None) -> tuple[dict, str]:
@@ -1162,40 +1831,373 @@ def load_config(workspace: str = None) -> tuple[dict, str]:
         tuple: (credentials_dict, workspace_name)
     """
     config = load_full_config()
-    workspaces = config.get("workspaces", {})
+    workspaces = config.get("workspaces") or {}
 
     if not workspaces:
         raise ValueError("No workspaces configured in config.json")
 
     # 1. Explicit workspace requested
     if workspace:
-        if workspace not in workspaces:
-            raise ValueError(f"Unknown workspace: {workspace}. Available: {list(workspaces.keys())}")
-        return workspaces[workspace], workspace
-
-    # 2. Try active workspace from session state (if recent)
-    active = get_active_workspace()
-    if active and active in workspaces:
-        return workspaces[active], active
+        return load_workspace_creds(workspace), workspace
 
-    # 3. Fall back to default
-    default = config.get("default_workspace")
-    if default and default in workspaces:
-        return workspaces[default], default
+    # 2. Recent active workspace from session state, 3. default, 4. first configured
+    for candidate in (get_active_workspace(), config.get("default_workspace")):
+        creds = workspaces.get(candidate) if candidate else None
+        if creds is not None:
+            return creds, candidate
 
-    # 4. Last resort: first workspace
     first_ws = next(iter(workspaces))
     return workspaces[first_ws], first_ws
 
 
+def load_workspace_creds(name: str) -> dict:
+    """Get the credentials for one workspace from the (cached) config."""
+    workspaces = load_full_config().get("workspaces") or {}
+    creds = workspaces.get(name)
+    if creds is None:
+        raise ValueError(f"Unknown workspace: {name}. Available: {list(workspaces.keys())}")
+    return creds
+
+
+def verify_workspaces(workspaces: dict) -> tuple[dict, dict]:
+    """
+    Run auth.test against every workspace concurrently.
+
+    Args:
+        workspaces: Workspace name -> credentials, as in config.json
+
+    Returns:
+        tuple: ({workspace: ok}, {workspace: error} for failures)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not workspaces:
+        return {}, {}
+
+    def check(creds: dict) -> dict:
+        client = SlackClient(creds["xoxc_token"], creds["xoxd_token"], creds.get("user_agent"))
+        return client.auth_test()
+
+    verified, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=min(16, len(workspaces))) as pool:
+        futures = {name: pool.submit(check, creds) for name, creds in workspaces.items()}
+        for name, future in futures.items():
+            try:
+                auth = future.result()
+                verified[name] = bool(auth.get("ok"))
+                if not auth.get("ok"):
+                    errors[name] = auth.get("error", "unknown")
+            except Exception as e:
+                verified[name] = False
+                errors[name] = str(e)
+
+    return verified, errors
+
+
 def get_link_style() -> str:
     """Get the configured link style preference."""
     config = load_full_config()
     return config.get("link_style", "app")
 
 
+# ==================== Client Commands ====================
+
+def _h_auth(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Test authentication."""
+    return client.auth_test(), None
+
+
+def _h_channels(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """List channels (cached briefly)."""
+    types = cmd_args[0] if cmd_args else DEFAULT_CHANNEL_TYPES
+    result = get_cached_response(ws_name, f"conversations.list:{types}",
+                                 CHANNELS_LIST_MAX_AGE_SECONDS,
+                                 lambda: client.channels_list(types=types))
+    return result, None
+
+
+def _h_users(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """List users (cached briefly)."""
+    result = get_cached_response(ws_name, "users.list", USERS_LIST_MAX_AGE_SECONDS,
+                                 client.users_list)
+    return result, None
+
+
+def _h_history(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Get channel history, optionally trimmed to --fields."""
+    fields = None
+    if "--fields" in cmd_args:
+        i = cmd_args.index("--fields")
+        if i + 1 >= len(cmd_args):
+            return {"error": "--fields requires a comma-separated list"}, None
+        fields = tuple(cmd_args[i + 1].split(","))
+        cmd_args = cmd_args[:i] + cmd_args[i + 2:]
+    if not cmd_args:
+        return {"error": "channel_id required"}, None
+    channel = cmd_args[0]
+    limit = int(cmd_args[1]) if len(cmd_args) > 1 else DEFAULT_HISTORY_LIMIT
+    return client.conversations_history(channel, limit, fields), channel
+
+
+def _h_history_all(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Get a channel's full history across all pages."""
+    if not cmd_args:
+        return {"error": "channel_id required"}, None
+    channel = cmd_args[0]
+    max_pages = int(cmd_args[1]) if len(cmd_args) > 1 else None
+    return fetch_all_history(client, channel, max_pages), channel
+
+
+def _h_replies(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Get thread replies."""
+    if len(cmd_args) < 2:
+        return {"error": "channel_id and thread_ts required"}, None
+    channel = cmd_args[0]
+    return client.conversations_replies(channel, cmd_args[1]), channel
+
+
+def _h_search(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Search messages."""
+    if not cmd_args:
+        return {"error": "query required"}, None
+    query = cmd_args[0]
+    count = int(cmd_args[1]) if len(cmd_args) > 1 else DEFAULT_SEARCH_COUNT
+    return client.search_messages(query, count), None
+
+
+def _h_send(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Send a message or thread reply."""
+    if len(cmd_args) < 2:
+        return {"error": "channel_id and text required"}, None
+    channel = cmd_args[0]
+    text = cmd_args[1]
+    thread_ts = cmd_args[2] if len(cmd_args) > 2 else None
+    return client.post_message(channel, text, thread_ts), channel
+
+
+def _h_permalink(client: SlackClient, ws_name: str, cmd_args: list[str]) -> tuple[dict, str | None]:
+    """Build a message permalink."""
+    n = len(cmd_args)
+    if n < 2:
+        return {"error": "channel_id and message_ts required"}, None
+    channel, message_ts = cmd_args[0], cmd_args[1]
+    workspace = cmd_args[2] if n > 2 else ws_name
+    link_style = cmd_args[3] if n > 3 else get_link_style()
+    permalink = client.get_permalink(channel, message_ts, workspace, link_style)
+    return {"ok": True, "permalink": permalink}, None
+
+
+# Command name -> handler(client, ws_name, cmd_args) -> (result, channel_to_record)
+HANDLERS = {
+    "auth": _h_auth,
+    "channels": _h_channels,
+    "users": _h_users,
+    "history": _h_history,
+    "history-all": _h_history_all,
+    "replies": _h_replies,
+    "search": _h_search,
+    "send": _h_send,
+    "permalink": _h_permalink,
+}
+
+# Commands that don't make their workspace the active one (pure lookups)
+_KEEP_ACTIVE_WORKSPACE = {"permalink"}
+
+
+def run_client_command(client: SlackClient, ws_name: str, command: str,
+                       cmd_args: list[str]) -> dict:
+    """
+    Run a single API command against an existing client.
+
+    Successful results are tagged with the workspace, which becomes the
+    active workspace (except for permalink lookups); channel commands also
+    record the channel's workspace.
+
+    Returns:
+        The command result. Usage errors are returned as {"error": ...}.
+    """
+    handler = HANDLERS.get(command)
+    if handler is None:
+        return {"error": f"Unknown command: {command}"}
+
+    result, channel = handler(client, ws_name, cmd_args)
+    if result.get("ok"):
+        if command not in _KEEP_ACTIVE_WORKSPACE:
+            set_active_workspace(ws_name)
+        if channel:
+            record_channel_workspace(channel, ws_name)
+        result["_workspace"] = ws_name
+    return result
+
+
+def run_batch(client: SlackClient, ws_name: str, cmd_args: list[str]) -> dict:
+    """
+    Run several API commands on one client, reusing its HTTP connection.
+
+    Commands are read as a JSON array of {"cmd": ..., "args": [...]} objects,
+    either from the first argument or from stdin.
+    """
+    raw = cmd_args[0] if cmd_args and cmd_args[0] != "-" else sys.stdin.read()
+    commands = json_loads(raw)
+    if not isinstance(commands, list):
+        return {"error": "batch expects a JSON array of {\"cmd\", \"args\"} objects"}
+
+    results = []
+    for item in commands:
+        try:
+            args = [str(a) for a in item.get("args", [])]
+            results.append(run_client_command(client, ws_name, item.get("cmd"), args))
+        except Exception as e:
+            results.append({"error": str(e)})
+
+    return {"ok": True, "results": results, "_workspace": ws_name}
+
+
+# ==================== Daemon Mode ====================
+
+DAEMON_IDLE_TIMEOUT_SECONDS = 600
+DAEMON_REQUEST_TIMEOUT_SECONDS = 10  # Per socket read/write, so a stuck caller can't block the daemon
+
+
+def get_daemon_socket_path() -> Path:
+    """Get the Unix socket path for the persistent client daemon."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "slack_client.sock"
+    return SKILL_ROOT / "slack-daemon.sock"
+
+
+def run_daemon(idle_timeout: int = DAEMON_IDLE_TIMEOUT_SECONDS):
+    """
+    Serve API commands over a Unix socket from one long-lived process.
+
+    Each connection sends one JSON line {"workspace", "cmd", "args"} and
+    receives one JSON line back. One SlackClient (and so one warm HTTP
+    session) is kept per workspace until config.json changes. Exits after
+    idle_timeout seconds without requests.
+    """
+    import socket
+
+    socket_path = get_daemon_socket_path()
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+                print(f"Daemon already running on {socket_path}", file=sys.stderr)
+                return
+            except OSError:
+                socket_path.unlink()  # Stale socket from a daemon that was killed
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    server.settimeout(idle_timeout)
+
+    clients = {}  # workspace name -> SlackClient
+    clients_mtime = _mtime_ns(CONFIG_PATH)  # config.json the clients were built from
+    print(f"Slack client daemon listening on {socket_path}", file=sys.stderr)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            conn.settimeout(DAEMON_REQUEST_TIMEOUT_SECONDS)
+            with conn, conn.makefile("rb") as reader:
+                try:
+                    line = reader.readline()
+                except socket.timeout:
+                    print("Daemon: timed out reading request", file=sys.stderr)
+                    continue
+                try:
+                    request = json_loads(line)
+                    config_mtime = _mtime_ns(CONFIG_PATH)
+                    if config_mtime != clients_mtime:
+                        # Tokens may have been refreshed; rebuild clients from the new config
+                        clients.clear()
+                        clients_mtime = config_mtime
+                    creds, ws_name = load_config(request.get("workspace"))
+                    client = clients.get(ws_name)
+                    if client is None:
+                        client = SlackClient(
+                            creds["xoxc_token"],
+                            creds["xoxd_token"],
+                            creds.get("user_agent")
+                        )
+                        clients[ws_name] = client
+                    args = [str(a) for a in request.get("args", [])]
+                    result = run_client_command(client, ws_name, request.get("cmd"), args)
+                except Exception as e:
+                    result = {"error": str(e)}
+                flush_session_state()
+                try:
+                    conn.sendall(json_dumps_compact(result) + b"\n")
+                except OSError as e:  # Caller timed out or went away
+                    print(f"Daemon: could not send reply: {e}", file=sys.stderr)
+    finally:
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def send_to_daemon(workspace: str | None, command: str, cmd_args: list[str]) -> dict:
+    """
+    Run an API command through the daemon, starting it if needed.
+
+    Raises:
+        ConnectionError: If the daemon could not be reached
+    """
+    import socket
+    import subprocess
+
+    socket_path = get_daemon_socket_path()
+    request = json_dumps_compact({"workspace": workspace, "cmd": command, "args": cmd_args})
+
+    for attempt in range(50):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.connect(str(socket_path))
+                conn.sendall(request + b"\n")
+                with conn.makefile("rb") as reader:
+                    return json_loads(reader.readline())
+        except (FileNotFoundError, ConnectionRefusedError):
+            if attempt == 0:
+                # Start a detached daemon, then retry while it binds the socket
+                subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "daemon"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            time.sleep(0.1)
+
+    raise ConnectionError(f"Could not reach daemon at {socket_path}")
+
+
 # ==================== CLI ====================
 
+# export flags that take a value, and boolean export flags, by option name
+_EXPORT_FLAGS = {"--from": "from_date", "--to": "to_date", "--output": "output_file"}
+_EXPORT_BOOLS = {"--resume": "resume"}
+
+
+def parse_export_args(cmd_args: list[str]) -> dict:
+    """Parse export arguments into from_date/to_date/output_file/resume; unknown args are ignored."""
+    opts = {"from_date": None, "to_date": None, "output_file": None, "resume": False}
+    it = iter(cmd_args)
+    for arg in it:
+        if arg in _EXPORT_FLAGS:
+            value = next(it, None)
+            if value is not None:
+                opts[_EXPORT_FLAGS[arg]] = value
+        elif arg in _EXPORT_BOOLS:
+            opts[_EXPORT_BOOLS[arg]] = True
+    return opts
+
+
 def parse_global_args() -> tuple[str | None, list[str]]:
     """
     Parse global flags like --workspace/-w.
@@ -1205,329 +2207,371 @@ def parse_global_args() -> tuple[str | None, list[str]]:
     """
     workspace = None
     args_filtered = []
-    i = 1  # Skip script name
+    it = iter(sys.argv[1:])  # Skip script name
 
-    while i < len(sys.argv):
-        if sys.argv[i] in ("--workspace", "-w"):
-            if i + 1 < len(sys.argv):
-                workspace = sys.argv[i + 1]
-                i += 2
-                continue
-            else:
-                print(json.dumps({"error": "--workspace requires a value"}))
+    for arg in it:
+        if arg in ("--workspace", "-w"):
+            workspace = next(it, None)
+            if workspace is None:
+                emit({"error": "--workspace requires a value"})
                 sys.exit(1)
-        args_filtered.append(sys.argv[i])
-        i += 1
+            continue
+        args_filtered.append(arg)
 
     return workspace, args_filtered
 
 
-def main():
-    """CLI interface for the Slack client."""
-    workspace_arg, args = parse_global_args()
+def _cli_workspaces(workspace_arg: str | None, cmd_args: list[str]):
+    """List configured workspaces, optionally verifying each with auth.test."""
+    config = load_full_config()
+    state = load_session_state()
+    result = {
+        "workspaces": list(config.get("workspaces", {}).keys()),
+        "default": config.get("default_workspace"),
+        "active": state.get("active_workspace"),
+        "link_style": config.get("link_style", "app")
+    }
+    if "--verify" in cmd_args:
+        result["verified"], errors = verify_workspaces(config.get("workspaces", {}))
+        if errors:
+            result["verify_errors"] = errors
+    emit(result)
 
-    if len(args) < 1:
-        print(json.dumps({
-            "error": "No command provided",
-            "usage": "slack_client.py [-w workspace] <command> [args]",
-            "commands": {
-                "auth": "Test authentication",
-                "channels": "List channels (optional: types)",
-                "users": "List users",
-                "history": "Get channel history (channel_id, optional: limit)",
-                "replies": "Get thread replies (channel_id, thread_ts)",
-                "search": "Search messages (query, optional: count)",
-                "send": "Send message (channel_id, text, optional: thread_ts)",
-                "permalink": "Get message permalink (channel_id, message_ts, optional: workspace, link_style)",
-                "workspaces": "List configured workspaces",
-                "switch": "Switch active workspace (workspace_name)",
-                "add-workspace": "Add a new workspace (name, xoxc, xoxd, optional: user_agent)",
-                "export": "Export messages (--from DATE --to DATE --output FILE [--resume])",
-                "export-status": "Check export status",
-                "fetch-users": "Fetch and cache all workspace users",
-                "user-lookup": "Get user ID to name lookup from cache",
-                "digest": "Generate overnight digest (mentions, replies, channel activity)",
-                "digest-config": "Show current digest configuration"
-            }
-        }, indent=2))
+
+def _cli_switch(workspace_arg: str | None, cmd_args: list[str]):
+    """Switch the active workspace."""
+    if not cmd_args:
+        emit({"error": "workspace name required"})
         sys.exit(1)
+    ws = cmd_args[0]
+    config = load_full_config()
+    if ws not in config.get("workspaces", {}):
+        result = {"error": f"Unknown workspace: {ws}",
+                  "available": list(config.get("workspaces", {}).keys())}
+    else:
+        set_active_workspace(ws)
+        result = {"ok": True, "active_workspace": ws}
+    emit(result)
 
-    command = args[0]
-    cmd_args = args[1:]
 
-    # Commands that don't need a client
-    if command == "workspaces":
-        config = load_full_config()
-        state = load_session_state()
-        result = {
-            "workspaces": list(config.get("workspaces", {}).keys()),
-            "default": config.get("default_workspace"),
-            "active": state.get("active_workspace"),
-            "link_style": config.get("link_style", "app")
-        }
-        print(json.dumps(result, indent=2))
-        return
+def _cli_add_workspace(workspace_arg: str | None, cmd_args: list[str]):
+    """Add (or replace) a workspace's credentials in config.json."""
+    if len(cmd_args) < 3:
+        emit({
+            "error": "Usage: add-workspace <name> <xoxc_token> <xoxd_token> [user_agent]"
+        })
+        sys.exit(1)
+    name, xoxc, xoxd = cmd_args[0], cmd_args[1], cmd_args[2]
+    user_agent = cmd_args[3] if len(cmd_args) > 3 else None
 
-    if command == "switch":
-        if not cmd_args:
-            print(json.dumps({"error": "workspace name required"}))
-            sys.exit(1)
-        ws = cmd_args[0]
-        config = load_full_config()
-        if ws not in config.get("workspaces", {}):
-            result = {"error": f"Unknown workspace: {ws}",
-                      "available": list(config.get("workspaces", {}).keys())}
-        else:
-            set_active_workspace(ws)
-            result = {"ok": True, "active_workspace": ws}
-        print(json.dumps(result, indent=2))
-        return
+    config = load_full_config()
+    if "workspaces" not in config:
+        config["workspaces"] = {}
+
+    # Use existing user_agent from another workspace if not provided
+    if not user_agent:
+        user_agent = next((ws["user_agent"] for ws in config["workspaces"].values()
+                           if ws.get("user_agent")), None)
+
+    config["workspaces"][name] = {
+        "xoxc_token": xoxc,
+        "xoxd_token": xoxd,
+        "user_agent": user_agent
+    }
 
-    if command == "add-workspace":
-        if len(cmd_args) < 3:
-            print(json.dumps({
-                "error": "Usage: add-workspace <name> <xoxc_token> <xoxd_token> [user_agent]"
-            }))
-            sys.exit(1)
-        name, xoxc, xoxd = cmd_args[0], cmd_args[1], cmd_args[2]
-        user_agent = cmd_args[3] if len(cmd_args) > 3 else None
-
-        config = load_full_config()
-        if "workspaces" not in config:
-            config["workspaces"] = {}
-
-        # Use existing user_agent from another workspace if not provided
-        if not user_agent and config["workspaces"]:
-            first_ws = next(iter(config["workspaces"]))
-            user_agent = config["workspaces"][first_ws].get("user_agent")
-
-        config["workspaces"][name] = {
-            "xoxc_token": xoxc,
-            "xoxd_token": xoxd,
-            "user_agent": user_agent
-        }
+    # Set as default if first workspace
+    if not config.get("default_workspace"):
+        config["default_workspace"] = name
 
-        # Set as default if first workspace
-        if not config.get("default_workspace"):
-            config["default_workspace"] = name
+    save_config(config)
+    result = {"ok": True, "added": name, "workspaces": list(config["workspaces"].keys())}
+    emit(result)
 
-        save_config(config)
-        result = {"ok": True, "added": name, "workspaces": list(config["workspaces"].keys())}
-        print(json.dumps(result, indent=2))
-        return
 
-    if command == "user-lookup":
-        # Get user lookup with stale-while-revalidate pattern:
-        # - Empty cache: fetch synchronously (first-time setup)
-        # - Stale cache (>14 days): return stale data, refresh in background
-        # - Fresh cache: return cached data
+def _cli_user_lookup(workspace_arg: str | None, cmd_args: list[str]):
+    """Print the cached user ID -> name lookup (stale-while-revalidate)."""
+    # Get user lookup with stale-while-revalidate pattern:
+    # - Empty cache: fetch synchronously (first-time setup)
+    # - Stale cache (>14 days): return stale data, refresh in background
+    # - Fresh cache: return cached data
+    try:
+        creds, ws_name = load_config(workspace_arg)
+    except Exception:
+        emit({"error": "No workspace configured"})
+        sys.exit(1)
+
+    cache = load_cache(ws_name)
+    cache_empty = is_user_cache_empty(ws_name, cache)
+    cache_stale = is_user_cache_stale(ws_name, cache)
+    refreshing = False
+
+    if cache_empty:
+        # First time - must fetch synchronously
+        print(f"User cache empty. Fetching users from {ws_name}...", file=sys.stderr)
         try:
-            creds, ws_name = load_config(workspace_arg)
-        except Exception:
-            print(json.dumps({"error": "No workspace configured"}))
+            client = SlackClient(
+                creds["xoxc_token"],
+                creds["xoxd_token"],
+                creds.get("user_agent")
+            )
+            fetch_and_cache_users(client, ws_name)
+        except Exception as e:
+            emit({"error": f"Failed to fetch users: {e}"})
             sys.exit(1)
+        cache = load_cache(ws_name)
+    elif cache_stale:
+        # Stale - return cached data, refresh in background
+        trigger_background_user_refresh(ws_name)
+        refreshing = True
 
-        cache_empty = is_user_cache_empty(ws_name)
-        cache_stale = is_user_cache_stale(ws_name)
-        refreshing = False
+    lookup = get_user_lookup(ws_name, cache)
+    result = {
+        "ok": True,
+        "workspace": ws_name,
+        "user_count": len(lookup),
+        "last_updated": cache.get("users_last_updated"),
+        "users": lookup
+    }
+    if refreshing:
+        result["refreshing_in_background"] = True
+    emit(result)
 
-        if cache_empty:
-            # First time - must fetch synchronously
-            print(f"User cache empty. Fetching users from {ws_name}...", file=sys.stderr)
-            try:
-                client = SlackClient(
-                    creds["xoxc_token"],
-                    creds["xoxd_token"],
-                    creds.get("user_agent")
-                )
-                fetch_and_cache_users(client, ws_name)
-            except Exception as e:
-                print(json.dumps({"error": f"Failed to fetch users: {e}"}))
-                sys.exit(1)
-        elif cache_stale:
-            # Stale - return cached data, refresh in background
-            trigger_background_user_refresh(ws_name)
-            refreshing = True
 
-        lookup = get_user_lookup(ws_name)
-        cache = load_cache(ws_name)
+def _cli_fetch_users(workspace_arg: str | None, cmd_args: list[str]):
+    """Fetch all workspace users into the cache."""
+    try:
+        creds, ws_name = load_config(workspace_arg)
+        client = SlackClient(
+            creds["xoxc_token"],
+            creds["xoxd_token"],
+            creds.get("user_agent")
+        )
+
+        print(f"Fetching users from {ws_name}...", file=sys.stderr)
+        stats = fetch_and_cache_users(client, ws_name)
         result = {
             "ok": True,
             "workspace": ws_name,
-            "user_count": len(lookup),
-            "last_updated": cache.get("users_last_updated"),
-            "users": lookup
+            **stats
         }
-        if refreshing:
-            result["refreshing_in_background"] = True
-        print(json.dumps(result, indent=2))
-        return
+        emit(result)
 
-    if command == "fetch-users":
-        try:
-            creds, ws_name = load_config(workspace_arg)
-            client = SlackClient(
-                creds["xoxc_token"],
-                creds["xoxd_token"],
-                creds.get("user_agent")
-            )
+    except Exception as e:
+        emit({"error": str(e)})
+        sys.exit(1)
 
-            print(f"Fetching users from {ws_name}...", file=sys.stderr)
-            stats = fetch_and_cache_users(client, ws_name)
-            result = {
-                "ok": True,
-                "workspace": ws_name,
-                **stats
-            }
-            print(json.dumps(result, indent=2))
 
-        except Exception as e:
-            print(json.dumps({"error": str(e)}))
-            sys.exit(1)
-        return
+def _cli_digest_config(workspace_arg: str | None, cmd_args: list[str]):
+    """Print the digest configuration."""
+    config = load_digest_config()
+    emit(config)
 
-    if command == "digest-config":
-        config = load_digest_config()
-        print(json.dumps(config, indent=2))
-        return
 
-    if command == "digest":
-        # Parse digest-specific arguments
-        output_file = None
-        i = 0
-        while i < len(cmd_args):
-            if cmd_args[i] == "--output" and i + 1 < len(cmd_args):
-                output_file = cmd_args[i + 1]
-                i += 2
-            else:
-                i += 1
+def _cli_digest(workspace_arg: str | None, cmd_args: list[str]):
+    """Generate the overnight digest."""
+    # Parse digest-specific arguments
+    output_file = None
+    i = 0
+    while i < len(cmd_args):
+        if cmd_args[i] == "--output" and i + 1 < len(cmd_args):
+            output_file = cmd_args[i + 1]
+            i += 2
+        else:
+            i += 1
 
-        try:
-            print("Generating Slack digest...", file=sys.stderr)
-            digest = run_digest(workspace=workspace_arg)
+    try:
+        print("Generating Slack digest...", file=sys.stderr)
+        digest = run_digest(workspace=workspace_arg)
 
-            # Write to file
-            if output_file:
-                output_path = output_file
-            else:
-                digest_config = load_digest_config()
-                output_path = write_digest_output(digest)
+        # Write to file
+        if output_file:
+            output_path = output_file
+        else:
+            output_path = write_digest_output(digest)
 
-            print(f"Digest written to: {output_path}", file=sys.stderr)
+        print(f"Digest written to: {output_path}", file=sys.stderr)
 
-            # Output summary to stdout
-            result = {
-                "ok": True,
-                "output_file": output_path,
-                "summary": digest["summary"],
-                "period": digest["period"]
-            }
-            print(json.dumps(result, indent=2))
+        # Output summary to stdout
+        result = {
+            "ok": True,
+            "output_file": output_path,
+            "summary": digest["summary"],
+            "period": digest["period"]
+        }
+        emit(result)
 
-        except Exception as e:
-            print(json.dumps({"error": str(e)}))
-            sys.exit(1)
-        return
+    except Exception as e:
+        emit({"error": str(e)})
+        sys.exit(1)
 
-    if command == "export-status":
-        # Check status without requiring workspace_arg - look at default/active
-        try:
-            _, ws_name = load_config(workspace_arg)
-        except Exception:
-            print(json.dumps({"error": "No workspace configured"}))
-            sys.exit(1)
 
-        state = load_export_state(ws_name)
-        if not state:
-            print(json.dumps({
-                "ok": True,
-                "workspace": ws_name,
-                "status": "no_export",
-                "message": "No export in progress or completed"
-            }, indent=2))
-        else:
-            result = {
-                "ok": True,
-                "workspace": ws_name,
-                "export_id": state.get("export_id"),
-                "status": state.get("status"),
-                "started_at": state.get("started_at"),
-                "updated_at": state.get("updated_at"),
-                "search_progress": state.get("search_progress"),
-                "thread_progress": {
-                    "pending": len(state.get("thread_progress", {}).get("threads_pending", [])),
-                    "fetched": len(state.get("thread_progress", {}).get("threads_fetched", []))
-                },
-                "errors": len(state.get("errors", []))
-            }
-            if state.get("status") == "completed":
-                result["output_file"] = state.get("config", {}).get("output_file")
-            print(json.dumps(result, indent=2))
-        return
+def _cli_export_status(workspace_arg: str | None, cmd_args: list[str]):
+    """Print progress of the current or last export."""
+    # Check status without requiring workspace_arg - look at default/active
+    try:
+        _, ws_name = load_config(workspace_arg)
+    except Exception:
+        emit({"error": "No workspace configured"})
+        sys.exit(1)
 
-    if command == "export":
-        # Parse export-specific arguments
-        from_date = None
-        to_date = None
-        output_file = None
-        resume = False
-
-        i = 0
-        while i < len(cmd_args):
-            if cmd_args[i] == "--from" and i + 1 < len(cmd_args):
-                from_date = cmd_args[i + 1]
-                i += 2
-            elif cmd_args[i] == "--to" and i + 1 < len(cmd_args):
-                to_date = cmd_args[i + 1]
-                i += 2
-            elif cmd_args[i] == "--output" and i + 1 < len(cmd_args):
-                output_file = cmd_args[i + 1]
-                i += 2
-            elif cmd_args[i] == "--resume":
-                resume = True
-                i += 1
-            else:
-                i += 1
-
-        # Validate args
-        if not resume and (not from_date or not to_date or not output_file):
-            print(json.dumps({
-                "error": "Required: --from DATE --to DATE --output FILE (or --resume)",
-                "usage": "export --from 2025-07-01 --to 2026-01-05 --output ~/slack-export.json",
-                "resume_usage": "export --resume"
-            }))
-            sys.exit(1)
+    state = load_export_state(ws_name)
+    if not state:
+        emit({
+            "ok": True,
+            "workspace": ws_name,
+            "status": "no_export",
+            "message": "No export in progress or completed"
+        })
+    else:
+        progress = state.get("thread_progress") or {}
+        status = state.get("status")
+        result = {
+            "ok": True,
+            "workspace": ws_name,
+            "export_id": state.get("export_id"),
+            "status": status,
+            "started_at": state.get("started_at"),
+            "updated_at": state.get("updated_at"),
+            "search_progress": state.get("search_progress"),
+            "thread_progress": {
+                "pending": progress.get("threads_pending_count"),
+                "fetched": progress.get("threads_fetched_count")
+            },
+            "errors": len(state.get("errors") or ())
+        }
+        if status == "completed":
+            result["output_file"] = (state.get("config") or {}).get("output_file")
+        emit(result)
+
+
+def _cli_export(workspace_arg: str | None, cmd_args: list[str]):
+    """Export the user's messages with thread context."""
+    opts = parse_export_args(cmd_args)
+    from_date = opts["from_date"]
+    to_date = opts["to_date"]
+    output_file = opts["output_file"]
+    resume = opts["resume"]
+
+    # Validate args
+    if not resume and (not from_date or not to_date or not output_file):
+        emit({
+            "error": "Required: --from DATE --to DATE --output FILE (or --resume)",
+            "usage": "export --from 2025-07-01 --to 2026-01-05 --output ~/slack-export.json",
+            "resume_usage": "export --resume"
+        })
+        sys.exit(1)
+    if not resume and not (_DATE_RE.fullmatch(from_date) and _DATE_RE.fullmatch(to_date)):
+        emit({"error": "Dates must be YYYY-MM-DD", "from": from_date, "to": to_date})
+        sys.exit(1)
 
-        try:
-            creds, ws_name = load_config(workspace_arg)
-            client = SlackClient(
-                creds["xoxc_token"],
-                creds["xoxd_token"],
-                creds.get("user_agent")
-            )
+    try:
+        creds, ws_name = load_config(workspace_arg)
+        client = SlackClient(
+            creds["xoxc_token"],
+            creds["xoxd_token"],
+            creds.get("user_agent")
+        )
 
-            # If resuming, get dates from saved state
-            if resume:
-                state = load_export_state(ws_name)
-                if not state:
-                    print(json.dumps({"error": "No export to resume"}))
-                    sys.exit(1)
-                from_date = state["config"]["from_date"]
-                to_date = state["config"]["to_date"]
-                output_file = state["config"]["output_file"]
-
-            result = run_export(client, ws_name, from_date, to_date, output_file, resume)
-            print(json.dumps({"ok": True, "status": result["status"]}, indent=2))
-
-        except KeyboardInterrupt:
-            print(json.dumps({"ok": True, "status": "paused", "message": "Use --resume to continue"}))
-            sys.exit(0)
-        except Exception as e:
-            print(json.dumps({"error": str(e)}))
-            sys.exit(1)
+        # With --resume the dates and output are None; run_export reads them from the saved state
+        result = run_export(client, ws_name, from_date, to_date, output_file, resume)
+        emit({"ok": True, "status": result["status"]})
+
+    except KeyboardInterrupt:
+        emit({"ok": True, "status": "paused", "message": "Use --resume to continue"})
+        sys.exit(0)
+    except Exception as e:
+        emit({"error": str(e)})
+        sys.exit(1)
+
+
+def _cli_daemon(workspace_arg: str | None, cmd_args: list[str]):
+    """Run the persistent client daemon."""
+    run_daemon()
+
+
+def _cli_fast(workspace_arg: str | None, cmd_args: list[str]):
+    """Run an API command through the persistent daemon."""
+    if not cmd_args:
+        emit({"error": "Usage: fast <command> [args]"})
+        sys.exit(1)
+    try:
+        # Resolve the workspace here so session context applies as usual
+        _, ws_name = load_config(workspace_arg)
+        result = send_to_daemon(ws_name, cmd_args[0], cmd_args[1:])
+    except Exception as e:
+        emit({"error": str(e)})
+        sys.exit(1)
+    if "error" in result and "ok" not in result:
+        emit(result)
+        sys.exit(1)
+    emit(result)
+
+
+# Commands handled without the shared client setup in main(); they take
+# (workspace_arg, cmd_args) and print their own result
+LOCAL_COMMANDS = {
+    "workspaces": _cli_workspaces,
+    "switch": _cli_switch,
+    "add-workspace": _cli_add_workspace,
+    "user-lookup": _cli_user_lookup,
+    "fetch-users": _cli_fetch_users,
+    "digest-config": _cli_digest_config,
+    "digest": _cli_digest,
+    "export-status": _cli_export_status,
+    "export": _cli_export,
+    "daemon": _cli_daemon,
+    "fast": _cli_fast,
+}
+
+
+def main():
+    """CLI interface for the Slack client."""
+    workspace_arg, args = parse_global_args()
+
+    if len(args) < 1:
+        emit({
+            "error": "No command provided",
+            "usage": "slack_client.py [-w workspace] <command> [args]",
+            "commands": {
+                "auth": "Test authentication",
+                "channels": "List channels (optional: types)",
+                "users": "List users",
+                "history": "Get channel history (channel_id, optional: limit, --fields ts,user,text)",
+                "history-all": "Get full channel history across pages (channel_id, optional: max_pages)",
+                "replies": "Get thread replies (channel_id, thread_ts)",
+                "search": "Search messages (query, optional: count)",
+                "send": "Send message (channel_id, text, optional: thread_ts)",
+                "permalink": "Get message permalink (channel_id, message_ts, optional: workspace, link_style)",
+                "fast": "Run an API command via the persistent daemon (command, args...)",
+                "daemon": "Run the persistent client daemon (started automatically by fast)",
+                "batch": "Run several commands on one connection (JSON array of {cmd, args}, or - for stdin)",
+                "workspaces": "List configured workspaces (optional: --verify to test each)",
+                "switch": "Switch active workspace (workspace_name)",
+                "add-workspace": "Add a new workspace (name, xoxc, xoxd, optional: user_agent)",
+                "export": "Export messages (--from DATE --to DATE --output FILE [--resume])",
+                "export-status": "Check export status",
+                "fetch-users": "Fetch and cache all workspace users",
+                "user-lookup": "Get user ID to name lookup from cache",
+                "digest": "Generate overnight digest (mentions, replies, channel activity)",
+                "digest-config": "Show current digest configuration"
+            }
+        })
+        sys.exit(1)
+
+    command = args[0]
+    cmd_args = args[1:]
+
+    # Commands that load their own config/client
+    local = LOCAL_COMMANDS.get(command)
+    if local is not None:
+        local(workspace_arg, cmd_args)
         return
 
-    # Commands that need a client
+    # Commands that need a client; reject unknown ones before building it
+    if command != "batch" and command not in HANDLERS:
+        emit({"error": f"Unknown command: {command}"})
+        sys.exit(1)
+
     try:
         creds, ws_name = load_config(workspace_arg)
         client = SlackClient(
@@ -1536,96 +2580,22 @@ def main():
             creds.get("user_agent")
         )
     except Exception as e:
-        print(json.dumps({"error": f"Failed to load config: {e}"}))
+        emit({"error": f"Failed to load config: {e}"})
         sys.exit(1)
 
     try:
-        if command == "auth":
-            result = client.auth_test()
-            if result.get("ok"):
-                # Update session state on successful auth
-                set_active_workspace(ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "channels":
-            types = cmd_args[0] if cmd_args else "public_channel,private_channel,im,mpim"
-            result = client.channels_list(types=types)
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "users":
-            result = client.users_list()
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "history":
-            if not cmd_args:
-                print(json.dumps({"error": "channel_id required"}))
-                sys.exit(1)
-            channel = cmd_args[0]
-            limit = int(cmd_args[1]) if len(cmd_args) > 1 else 100
-            result = client.conversations_history(channel, limit)
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                record_channel_workspace(channel, ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "replies":
-            if len(cmd_args) < 2:
-                print(json.dumps({"error": "channel_id and thread_ts required"}))
-                sys.exit(1)
-            channel = cmd_args[0]
-            result = client.conversations_replies(channel, cmd_args[1])
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                record_channel_workspace(channel, ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "search":
-            if not cmd_args:
-                print(json.dumps({"error": "query required"}))
-                sys.exit(1)
-            query = cmd_args[0]
-            count = int(cmd_args[1]) if len(cmd_args) > 1 else 20
-            result = client.search_messages(query, count)
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "send":
-            if len(cmd_args) < 2:
-                print(json.dumps({"error": "channel_id and text required"}))
-                sys.exit(1)
-            channel = cmd_args[0]
-            text = cmd_args[1]
-            thread_ts = cmd_args[2] if len(cmd_args) > 2 else None
-            result = client.post_message(channel, text, thread_ts)
-            if result.get("ok"):
-                set_active_workspace(ws_name)
-                record_channel_workspace(channel, ws_name)
-                result["_workspace"] = ws_name
-
-        elif command == "permalink":
-            if len(cmd_args) < 2:
-                print(json.dumps({"error": "channel_id and message_ts required"}))
-                sys.exit(1)
-            channel = cmd_args[0]
-            message_ts = cmd_args[1]
-            workspace = cmd_args[2] if len(cmd_args) > 2 else ws_name
-            link_style = cmd_args[3] if len(cmd_args) > 3 else get_link_style()
-            permalink = client.get_permalink(channel, message_ts, workspace, link_style)
-            result = {"ok": True, "permalink": permalink, "_workspace": ws_name}
-
+        if command == "batch":
+            result = run_batch(client, ws_name, cmd_args)
         else:
-            print(json.dumps({"error": f"Unknown command: {command}"}))
+            result = run_client_command(client, ws_name, command, cmd_args)
+        if "error" in result and "ok" not in result:
+            emit(result)
             sys.exit(1)
 
-        print(json.dumps(result, indent=2))
+        emit(result)
 
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
+        emit({"error": str(e)})
         sys.exit(1)
 
 
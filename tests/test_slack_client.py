@@ -0,0 +1,148 @@
+"""Tests for SlackClient's HTTP handling against a local stand-in for the Slack API."""
+import http.server
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import slack_client  # noqa: E402
+
+
+class _SlackStub(http.server.BaseHTTPRequestHandler):
+    """Answers each POST with the next queued (status, headers, body) response."""
+
+    responses = []
+    hits = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).hits.append(self.path)
+        status, headers, body = type(self).responses.pop(0)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+RATELIMITED = (429, {"Retry-After": "7"}, b'{"ok":false,"error":"ratelimited"}')
+OK = (200, {}, b'{"ok":true,"messages":[]}')
+UNAVAILABLE = (503, {}, b'{"ok":false,"error":"service_unavailable"}')
+
+
+class SlackClientHTTPTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.HTTPServer(("127.0.0.1", 0), _SlackStub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+        class LocalClient(slack_client.SlackClient):
+            BASE_URL = f"http://127.0.0.1:{cls.server.server_port}/api"
+
+        cls.client_class = LocalClient
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _SlackStub.responses = []
+        _SlackStub.hits = []
+        self.client = self.client_class("xoxc-test", "xoxd-test")
+
+    def test_429_is_not_retried_by_urllib3(self):
+        _SlackStub.responses = [RATELIMITED, OK, OK, OK]
+
+        result = self.client.conversations_replies("C1", "1700000000.000100")
+
+        self.assertEqual(len(_SlackStub.hits), 1)
+        self.assertEqual(result["error"], "ratelimited")
+        self.assertEqual(result["retry_after"], 7)
+
+    def test_gateway_error_retried_for_reads_only(self):
+        _SlackStub.responses = [UNAVAILABLE, OK, UNAVAILABLE, OK]
+
+        self.assertTrue(self.client.conversations_replies("C1", "1700000000.000100")["ok"])
+        self.assertEqual(len(_SlackStub.hits), 2)
+
+        # The message may have been posted before the gateway failed
+        self.assertFalse(self.client.post_message("C1", "hello")["ok"])
+        self.assertEqual(_SlackStub.hits[2:], ["/api/chat.postMessage"])
+
+    def test_retry_after_reaches_rate_limiter(self):
+        _SlackStub.responses = [RATELIMITED, OK]
+
+        class RecordingLimiter(slack_client.RateLimiter):
+            def __init__(self):
+                super().__init__()
+                self.retry_afters = []
+
+            def handle_rate_limit_response(self, retry_after=None):
+                self.retry_afters.append(retry_after)  # Record instead of sleeping
+
+        limiter = RecordingLimiter()
+        result, calls = slack_client._fetch_with_backoff(
+            limiter, limiter.wait_for_tier4,
+            lambda: self.client.conversations_replies("C1", "1700000000.000100"))
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(calls, 2)
+        self.assertEqual(limiter.retry_afters, [7])
+        self.assertEqual(len(_SlackStub.hits), 2)
+
+
+class _ExportStub:
+    """Client stand-in for run_export: records search queries, optionally failing them."""
+
+    def __init__(self, fail_search: bool = False):
+        self.fail_search = fail_search
+        self.queries = []
+
+    def auth_test(self):
+        return {"ok": True, "user_id": "UME", "user": "me"}
+
+    def search_messages_paginated(self, query, page=1, count=100, sort="timestamp"):
+        self.queries.append((query, page))
+        if self.fail_search:
+            raise RuntimeError("search unavailable")
+        return {"ok": True, "messages": {"matches": [], "total": 0, "paging": {"pages": 1}}}
+
+
+class ExportResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.skill_root = slack_client.SKILL_ROOT
+        slack_client.SKILL_ROOT = Path(self.tmp.name)
+        self.addCleanup(setattr, slack_client, "SKILL_ROOT", self.skill_root)
+        for path_func in (slack_client.get_export_state_path, slack_client.get_export_data_path):
+            path_func.cache_clear()
+            self.addCleanup(path_func.cache_clear)
+
+    def test_resume_after_search_failure_uses_saved_dates(self):
+        output = str(Path(self.tmp.name) / "export.json")
+        with self.assertRaises(RuntimeError):
+            slack_client.run_export(_ExportStub(fail_search=True), "ws",
+                                    "2025-01-01", "2025-02-01", output)
+        self.assertEqual(slack_client.load_export_state("ws")["status"], "searching")
+
+        client = _ExportStub()
+        state = slack_client.run_export(client, "ws", None, None, None, resume=True)
+
+        self.assertEqual(client.queries, [("from:me after:2025-01-01 before:2025-02-01", 1)])
+        self.assertEqual(state["status"], "completed")
+        self.assertTrue(Path(output).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()